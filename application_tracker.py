@@ -0,0 +1,274 @@
+"""
+Job application tracker stored in SQLite (WAL mode). Every list view is an indexed
+keyset-paginated query, so it stays fast with thousands of applications per user.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+import pandas as pd
+import streamlit as st
+
+DB_PATH = os.getenv("APPLICATION_TRACKER_DB", os.path.join(".data", "applications.db"))
+STATUSES = ["Applied", "Screening", "Interview", "Offer", "Rejected", "Withdrawn"]
+PAGE_SIZE = 50
+COLUMNS = ["id", "company", "role", "status", "applied_date", "location", "url", "source", "notes", "updated_at"]
+# LinkedIn data export: "Job Applications.csv" -> tracker columns
+LINKEDIN_COLUMNS = {"Company Name": "company", "Job Title": "role", "Application Date": "applied_date",
+                    "Job Url": "url"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    company TEXT NOT NULL COLLATE NOCASE,
+    role TEXT NOT NULL,
+    status TEXT NOT NULL,
+    applied_date TEXT NOT NULL,
+    location TEXT,
+    url TEXT,
+    source TEXT,
+    notes TEXT,
+    updated_at TEXT NOT NULL
+);
+-- Every view is scoped to one user and ordered newest first
+CREATE INDEX IF NOT EXISTS idx_applications_user_date ON applications (user_id, applied_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_applications_user_status ON applications (user_id, status, applied_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_applications_user_company ON applications (user_id, company, applied_date DESC);
+-- Re-importing the same export doesn't duplicate rows
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_unique ON applications (user_id, company, role, applied_date);
+"""
+
+
+class ApplicationStore:
+    """
+    One connection per thread (Streamlit serves each session on its own thread);
+    WAL lets those readers run alongside a writer.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Safe with WAL: a crash can lose the last commits but never corrupts the file
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def add(self, user_id, company, role, status="Applied", applied_date=None, location=None, url=None,
+            source="manual", notes=None):
+        return self.bulk_import(user_id, [{
+            "company": company, "role": role, "status": status, "applied_date": applied_date,
+            "location": location, "url": url, "source": source, "notes": notes,
+        }])
+
+    def bulk_import(self, user_id, records):
+        """
+        Insert many applications in one transaction; returns how many were new
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for record in records:
+            company, role = str(record.get("company") or "").strip(), str(record.get("role") or "").strip()
+            if not company or not role:
+                continue
+            applied = record.get("applied_date") or date.today()
+            rows.append((user_id, company, role, record.get("status") or "Applied", _iso_date(applied),
+                         record.get("location"), record.get("url"), record.get("source"), record.get("notes"), now))
+        conn = self._connection()
+        with conn:
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO applications
+                    (user_id, company, role, status, applied_date, location, url, source, notes, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            return conn.total_changes - before
+
+    def import_linkedin_csv(self, user_id, file):
+        """
+        Import LinkedIn's "Job Applications.csv" data export. Returns (new applications,
+        rows skipped because their application date is missing or unreadable).
+        """
+        df = pd.read_csv(file, usecols=lambda c: c in LINKEDIN_COLUMNS).rename(columns=LINKEDIN_COLUMNS)
+        missing = {"company", "role"} - set(df.columns)
+        if missing:
+            raise ValueError(f"Not a LinkedIn job applications export (missing {', '.join(sorted(missing))})")
+        skipped = 0
+        if "applied_date" in df:
+            applied = pd.to_datetime(df["applied_date"], errors="coerce", format="mixed")
+            # bulk_import would date these today, which misorders them and defeats deduplication
+            skipped = int(applied.isna().sum())
+            df = df[applied.notna()].assign(applied_date=applied[applied.notna()].dt.date)
+        df = df.astype(object).where(df.notna(), None)
+        df["source"] = "linkedin"
+        return self.bulk_import(user_id, df.to_dict("records")), skipped
+
+    def update_status(self, user_id, application_id, status):
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE applications SET status = ?, updated_at = ? WHERE user_id = ? AND id = ?",
+                         (status, datetime.now().isoformat(timespec="seconds"), user_id, application_id))
+
+    def delete(self, user_id, application_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM applications WHERE user_id = ? AND id = ?", (user_id, application_id))
+
+    def _where(self, user_id, statuses=None, company=None, date_from=None, date_to=None):
+        clauses, params = ["user_id = ?"], [user_id]
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if company:
+            # Prefix match, so the NOCASE company index can serve it
+            clauses.append("company LIKE ? ESCAPE '\\'")
+            params.append(company.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if date_from:
+            clauses.append("applied_date >= ?")
+            params.append(_iso_date(date_from))
+        if date_to:
+            clauses.append("applied_date <= ?")
+            params.append(_iso_date(date_to))
+        return clauses, params
+
+    def query(self, user_id, statuses=None, company=None, date_from=None, date_to=None, limit=PAGE_SIZE,
+              cursor=None):
+        """
+        One page of applications, newest first. `cursor` is the (applied_date, id)
+        of the last row on the previous page; returns (frame, next_cursor or None).
+        """
+        clauses, params = self._where(user_id, statuses, company, date_from, date_to)
+        if cursor:
+            # Keyset pagination: seek past the previous page instead of OFFSET-scanning it
+            clauses.append("(applied_date, id) < (?, ?)")
+            params.extend(cursor)
+        rows = self._connection().execute(f"""
+            SELECT {', '.join(COLUMNS)} FROM applications
+            WHERE {' AND '.join(clauses)}
+            ORDER BY applied_date DESC, id DESC
+            LIMIT ?
+        """, [*params, limit + 1]).fetchall()
+        next_cursor = (rows[limit - 1]["applied_date"], rows[limit - 1]["id"]) if len(rows) > limit else None
+        return pd.DataFrame([dict(row) for row in rows[:limit]], columns=COLUMNS), next_cursor
+
+    def status_counts(self, user_id, company=None, date_from=None, date_to=None):
+        clauses, params = self._where(user_id, None, company, date_from, date_to)
+        rows = self._connection().execute(f"""
+            SELECT status, COUNT(*) AS n FROM applications
+            WHERE {' AND '.join(clauses)}
+            GROUP BY status
+        """, params).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+def _iso_date(value):
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+@st.cache_resource
+def get_store(path=DB_PATH):
+    return ApplicationStore(path)
+
+
+def render_tracker(user_id):
+    store = get_store()
+    st.markdown("### 📅 Application Tracker")
+
+    with st.expander("➕ Add an application"):
+        with st.form("add_application", clear_on_submit=True):
+            company_col, role_col = st.columns(2)
+            company = company_col.text_input("Company")
+            role = role_col.text_input("Role")
+            status_col, date_col, location_col = st.columns(3)
+            status = status_col.selectbox("Status", STATUSES)
+            applied = date_col.date_input("Applied on", value=date.today())
+            location = location_col.text_input("Location")
+            url = st.text_input("Job URL")
+            notes = st.text_area("Notes")
+            if st.form_submit_button("Save"):
+                if store.add(user_id, company, role, status, applied, location or None, url or None,
+                             notes=notes or None):
+                    st.success(f"Saved {role} at {company}.")
+                else:
+                    st.warning("Company and role are required, and the same application can't be added twice.")
+
+    filter_cols = st.columns([2, 2, 1, 1])
+    statuses = filter_cols[0].multiselect("Status", STATUSES, key="tracker_statuses")
+    company = filter_cols[1].text_input("Company starts with", key="tracker_company")
+    date_from = filter_cols[2].date_input("From", value=None, key="tracker_from")
+    date_to = filter_cols[3].date_input("To", value=None, key="tracker_to")
+
+    # Restart paging whenever the filters change
+    filters = (user_id, tuple(statuses), company, date_from, date_to)
+    if st.session_state.get("tracker_filters") != filters:
+        st.session_state.tracker_filters = filters
+        st.session_state.tracker_cursors = [None]
+    cursors = st.session_state.tracker_cursors
+
+    start = time.perf_counter()
+    page, next_cursor = store.query(user_id, statuses, company, date_from, date_to, PAGE_SIZE, cursors[-1])
+    counts = store.status_counts(user_id, company, date_from, date_to)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    metric_cols = st.columns(len(STATUSES))
+    for col, name in zip(metric_cols, STATUSES):
+        col.metric(name, counts.get(name, 0))
+    st.dataframe(page.drop(columns=["updated_at"]), use_container_width=True, hide_index=True)
+    st.caption(f"Page {len(cursors)} · {len(page)} application(s) · queried in {elapsed_ms:.1f} ms")
+
+    prev_col, next_col = st.columns(2)
+    if prev_col.button("⬅️ Previous", disabled=len(cursors) == 1, key="tracker_prev"):
+        cursors.pop()
+        st.rerun()
+    if next_col.button("Next ➡️", disabled=next_cursor is None, key="tracker_next"):
+        cursors.append(next_cursor)
+        st.rerun()
+
+    if not page.empty:
+        with st.expander("✏️ Update status"):
+            labels = {row.id: f"{row.company} · {row.role} ({row.applied_date})" for row in page.itertuples()}
+            application_id = st.selectbox("Application", list(labels), format_func=labels.get,
+                                          key="tracker_update_id")
+            new_status = st.selectbox("New status", STATUSES, key="tracker_update_status")
+            update_col, delete_col = st.columns(2)
+            if update_col.button("Update", key="tracker_update"):
+                store.update_status(user_id, int(application_id), new_status)
+                st.rerun()
+            if delete_col.button("🗑️ Delete", key="tracker_delete"):
+                store.delete(user_id, int(application_id))
+                st.rerun()
+
+
+def render_linkedin_import(user_id):
+    store = get_store()
+    st.markdown("### 🔗 LinkedIn Import")
+    st.write("In LinkedIn go to **Settings → Data privacy → Get a copy of your data**, choose "
+             "**Job Applications**, and upload the `Job Applications.csv` file from the archive.")
+    export = st.file_uploader("LinkedIn job applications export (CSV):", type=["csv"], key="linkedin_export")
+    if export is not None and st.button("Import applications", key="linkedin_import"):
+        try:
+            with st.spinner("Importing..."):
+                start = time.perf_counter()
+                added, skipped = store.import_linkedin_csv(user_id, export)
+                elapsed = time.perf_counter() - start
+            st.success(f"Imported {added} new application(s) in {elapsed:.2f}s. "
+                       "Open the 📅 Application Tracker to review them.")
+            if skipped:
+                st.warning(f"Skipped {skipped} row(s) without a readable application date.")
+        except ValueError as e:
+            st.error(str(e))
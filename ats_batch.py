@@ -0,0 +1,303 @@
+"""
+Headless bulk resume screening against one job description.
+
+    python ats_batch.py screen --resumes ./resumes --jd job.txt --output ranked.csv
+    python ats_batch.py screen --resumes ./resumes --jd job.txt --output ranked.jsonl \\
+        --endpoint http://127.0.0.1:8765/v1/chat/completions
+    python ats_batch.py screen --resumes ./resumes --jd job.txt --output ranked.csv --offline
+    python ats_batch.py stub-server --port 8765
+
+Resumes are parsed/rendered in a process pool, scored with at most --concurrency
+requests in flight (retrying with exponential backoff), and every finished resume is
+appended to a checkpoint file so an interrupted run picks up where it stopped.
+With --offline, resumes are scored locally by ats_scoring in a single vectorized pass.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+import ats_tracker
+import ats_scoring
+from llm_gateway import RetryableError, with_retries
+
+SCREENING_PROMPT = """
+    As an ATS scanner, evaluate the resume against the job description.
+    Respond with JSON only, in the form:
+    {"match_percentage": <0-100>, "missing_keywords": [<keywords>], "summary": "<one or two sentences>"}
+"""
+
+
+def prepare_resume(path, offline=False):
+    """
+    Read one PDF and build its request parts (runs in a worker process). Offline
+    scoring only needs the text layer, so scanned pages aren't rendered.
+    """
+    with open(path, "rb") as f:
+        pdf_bytes = f.read()
+    if offline:
+        parts = [text for text in ats_tracker.extract_pdf_text(pdf_bytes) if text.strip()]
+    else:
+        parts = ats_tracker.resume_parts(pdf_bytes)
+    return {"path": path, "sha256": hashlib.sha256(pdf_bytes).hexdigest(), "parts": parts}
+
+
+def parse_score(text):
+    """
+    Pull the structured result out of a model reply, tolerating code fences and prose
+    """
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+            return {
+                "match_percentage": float(data.get("match_percentage")),
+                "missing_keywords": data.get("missing_keywords") or [],
+                "summary": data.get("summary", ""),
+            }
+        except (ValueError, TypeError):
+            pass
+    percent = re.search(r"(\d{1,3}(?:\.\d+)?)\s*%", text)
+    return {
+        "match_percentage": float(percent.group(1)) if percent else None,
+        "missing_keywords": [],
+        "summary": text.strip()[:500],
+    }
+
+
+def call_endpoint(endpoint, model, job_description, parts, timeout=60):
+    """
+    OpenAI-compatible chat completion request; images are sent as data URLs
+    """
+    content = [{"type": "text", "text": job_description}]
+    for part in parts:
+        if isinstance(part, str):
+            content.append({"type": "text", "text": part})
+        else:
+            content.append({"type": "image_url",
+                            "image_url": {"url": f"data:{part['mime_type']};base64,{part['data']}"}})
+    content.append({"type": "text", "text": SCREENING_PROMPT})
+    response = requests.post(endpoint, json={"model": model, "messages": [{"role": "user", "content": content}]},
+                             timeout=timeout)
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableError(f"HTTP {response.status_code}")
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"]
+
+
+def score_resume(resume, job_description, endpoint=None, model=ats_tracker.GEMINI_MODEL, retries=4):
+    start = time.perf_counter()
+    if endpoint:
+        text = with_retries(lambda: call_endpoint(endpoint, model, job_description, resume["parts"]), retries)
+    else:
+        # llm_gateway applies the Gemini concurrency/rate limits and retries
+        text = ats_tracker.get_gemini_response(job_description, resume["parts"], SCREENING_PROMPT)
+    result = parse_score(text)
+    result.update({
+        "file": os.path.basename(resume["path"]),
+        "path": resume["path"],
+        "sha256": resume["sha256"],
+        "latency_seconds": round(time.perf_counter() - start, 3),
+    })
+    return result
+
+
+def score_offline(resumes, job_description):
+    """
+    Score every parsed resume in one batch with the local engine
+    """
+    start = time.perf_counter()
+    texts = [ats_scoring.resume_text(resume["parts"]) for resume in resumes]
+    scores = ats_scoring.get_scorer().score(job_description, texts)
+    latency = (time.perf_counter() - start) / max(len(resumes), 1)
+    records = []
+    for resume, text, result in zip(resumes, texts, scores):
+        result.update({
+            "file": os.path.basename(resume["path"]),
+            "path": resume["path"],
+            "sha256": resume["sha256"],
+            "latency_seconds": round(latency, 6),
+        })
+        if not text.strip():
+            result.update({"match_percentage": None, "error": "no text layer (scanned resume)"})
+        records.append(result)
+    return records
+
+
+def load_checkpoint(path, jd_sha256):
+    """
+    Results already finished by an earlier run against the same job description,
+    keyed by resume content hash
+    """
+    done = {}
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short when the previous run was killed
+                    continue
+                if record.get("jd_sha256") == jd_sha256:
+                    done[record["sha256"]] = record
+    return done
+
+
+def write_ranked(results, output):
+    ranked = sorted(results, key=lambda r: (r.get("match_percentage") is None, -(r.get("match_percentage") or 0)))
+    for rank, record in enumerate(ranked, start=1):
+        record["rank"] = rank
+    if output.endswith(".jsonl"):
+        with open(output, "w", encoding="utf-8") as f:
+            for record in ranked:
+                f.write(json.dumps(record) + "\n")
+    else:
+        fields = ["rank", "file", "match_percentage", "missing_keywords", "missing_skills", "summary",
+                  "latency_seconds", "error", "path", "sha256"]
+        with open(output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for record in ranked:
+                row = dict(record)
+                row["missing_keywords"] = "; ".join(map(str, row.get("missing_keywords") or []))
+                row["missing_skills"] = "; ".join(map(str, row.get("missing_skills") or []))
+                writer.writerow(row)
+    return ranked
+
+
+def screen(resume_dir, jd_path, output, checkpoint=None, workers=None, concurrency=4, endpoint=None,
+           model=ats_tracker.GEMINI_MODEL, retries=4, offline=False):
+    with open(jd_path, encoding="utf-8") as f:
+        job_description = f.read()
+    paths = sorted(os.path.join(resume_dir, name) for name in os.listdir(resume_dir)
+                   if name.lower().endswith(".pdf"))
+    if offline:
+        return screen_offline(paths, job_description, output, workers)
+    jd_sha256 = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+    checkpoint = checkpoint or output + ".checkpoint.jsonl"
+    done = load_checkpoint(checkpoint, jd_sha256)
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as parsers, \
+            ThreadPoolExecutor(max_workers=concurrency) as scorers, \
+            open(checkpoint, "a", encoding="utf-8") as log:
+        parsing = {parsers.submit(prepare_resume, path): path for path in paths}
+        scoring = {}
+        for future in as_completed(parsing):
+            path = parsing[future]
+            try:
+                resume = future.result()
+            except Exception as e:
+                results[path] = {"file": os.path.basename(path), "path": path, "sha256": "",
+                                 "match_percentage": None, "error": f"parse failed: {e}"}
+                continue
+            if resume["sha256"] in done:
+                results[path] = done[resume["sha256"]]
+                continue
+            scoring[scorers.submit(score_resume, resume, job_description, endpoint, model, retries)] = resume
+
+        for future in as_completed(scoring):
+            resume = scoring[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {"file": os.path.basename(resume["path"]), "path": resume["path"],
+                          "sha256": resume["sha256"], "match_percentage": None, "error": str(e)}
+                # Failures aren't checkpointed, so the next run retries them
+                results[resume["path"]] = record
+                print(f"failed: {record['file']}: {e}", file=sys.stderr)
+                continue
+            record["jd_sha256"] = jd_sha256
+            results[resume["path"]] = record
+            log.write(json.dumps(record) + "\n")
+            log.flush()
+            print(f"scored {len(results)}/{len(paths)}: {record['file']} -> {record['match_percentage']}",
+                  file=sys.stderr)
+
+    return write_ranked(list(results.values()), output)
+
+
+def screen_offline(paths, job_description, output, workers=None):
+    """
+    Parse in the process pool, then score everything locally. No checkpoint: a rerun
+    costs no API quota.
+    """
+    results, parsed = [], []
+    with ProcessPoolExecutor(max_workers=workers) as parsers:
+        parsing = {parsers.submit(prepare_resume, path, True): path for path in paths}
+        for future in as_completed(parsing):
+            path = parsing[future]
+            try:
+                parsed.append(future.result())
+            except Exception as e:
+                results.append({"file": os.path.basename(path), "path": path, "sha256": "",
+                                "match_percentage": None, "error": f"parse failed: {e}"})
+    results.extend(score_offline(parsed, job_description))
+    print(f"scored {len(parsed)} resumes offline", file=sys.stderr)
+    return write_ranked(results, output)
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """
+    Deterministic stand-in for the chat completions endpoint: the score is derived
+    from a hash of the request, so runs are repeatable without an API key
+    """
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        score = int(hashlib.sha256(body).hexdigest(), 16) % 101
+        reply = json.dumps({"match_percentage": score, "missing_keywords": ["docker", "kubernetes"],
+                            "summary": "Stub evaluation."})
+        payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": reply}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk resume screening against a job description")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("screen", help="rank a directory of PDF resumes")
+    run.add_argument("--resumes", required=True, help="directory of PDF resumes")
+    run.add_argument("--jd", required=True, help="job description text file")
+    run.add_argument("--output", required=True, help="ranked results (.csv or .jsonl)")
+    run.add_argument("--checkpoint", help="progress file (default: <output>.checkpoint.jsonl)")
+    run.add_argument("--workers", type=int, help="parser processes (default: CPU count)")
+    run.add_argument("--concurrency", type=int, default=4, help="LLM requests in flight")
+    run.add_argument("--retries", type=int, default=4, help="retries per request to --endpoint")
+    run.add_argument("--endpoint", help="OpenAI-compatible chat completions URL (default: Gemini)")
+    run.add_argument("--model", default=ats_tracker.GEMINI_MODEL)
+    run.add_argument("--offline", action="store_true", help="score locally with ats_scoring, without an LLM")
+
+    stub = commands.add_parser("stub-server", help="serve a deterministic local stand-in LLM endpoint")
+    stub.add_argument("--host", default="127.0.0.1")
+    stub.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "stub-server":
+        server = ThreadingHTTPServer((args.host, args.port), StubLLMHandler)
+        print(f"Stub LLM listening on http://{args.host}:{args.port}/v1/chat/completions", file=sys.stderr)
+        server.serve_forever()
+    else:
+        ranked = screen(args.resumes, args.jd, args.output, args.checkpoint, args.workers, args.concurrency,
+                        args.endpoint, args.model, args.retries, args.offline)
+        print(f"Wrote {len(ranked)} ranked resumes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Offline ATS match scoring: skills from a maintained vocabulary plus term-frequency similarity,
+computed as sparse matrix products so a batch of resumes is scored in one pass.
+"""
+import json
+import os
+from functools import lru_cache
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer, ENGLISH_STOP_WORDS
+from text_tokens import tokenize
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_vocabulary.json")
+# Weight of vocabulary skill coverage vs. whole-text cosine similarity in the match score
+SKILL_WEIGHT = 0.6
+# Vocabulary aliases in the JD considered for the missing-keyword list, by term frequency
+TOP_KEYWORDS = 25
+
+
+def load_vocabulary(path=SKILLS_PATH):
+    """
+    Canonical skill names, their aliases, and a sparse alias -> skill mapping. A skill's
+    listed spellings are its aliases; the canonical name only stands in when none are
+    listed, so ambiguous names ("R", "Go", "Express") match only their explicit spellings.
+    """
+    with open(path, encoding="utf-8") as f:
+        skills = json.load(f)
+    names = list(skills)
+    aliases, rows, cols = {}, [], []
+    for col, (name, spellings) in enumerate(skills.items()):
+        for spelling in spellings or [name]:
+            alias = " ".join(tokenize(spelling))
+            if not alias:
+                continue
+            row = aliases.setdefault(alias, len(aliases))
+            rows.append(row)
+            cols.append(col)
+    mapping = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                                shape=(len(aliases), len(names)))
+    # An alias listed twice for one skill must still count once
+    mapping.data[:] = 1
+    return names, list(aliases), mapping
+
+
+class ATSScorer:
+    """
+    Scores resumes against a job description without an LLM call. Results are
+    deterministic for the same inputs and vocabulary.
+    """
+
+    def __init__(self, vocabulary_path=SKILLS_PATH, skill_weight=SKILL_WEIGHT, top_keywords=TOP_KEYWORDS):
+        self.skill_names, aliases, self.alias_to_skill = load_vocabulary(vocabulary_path)
+        self.skill_weight = skill_weight
+        self.top_keywords = top_keywords
+        max_words = max(len(alias.split()) for alias in aliases)
+        self.alias_rows = {alias: row for row, alias in enumerate(aliases)}
+        self.phrases = {alias for alias in aliases if " " in alias}
+        self.max_phrase_words = max_words
+        self.alias_vectorizer = CountVectorizer(tokenizer=tokenize, token_pattern=None, lowercase=False,
+                                                vocabulary=aliases, ngram_range=(1, max_words), binary=True)
+
+    def skills(self, texts):
+        """
+        Boolean (documents x skills) matrix of vocabulary skills found in each text
+        """
+        found = self.alias_vectorizer.transform(texts) @ self.alias_to_skill
+        return (found > 0).astype(np.float32).tocsr()
+
+    def keyword_terms(self, text):
+        """
+        Words (no stop words or single letters) plus the multi-word vocabulary aliases in `text`
+        """
+        tokens = tokenize(text)
+        terms = [token for token in tokens if len(token) > 1 and token not in ENGLISH_STOP_WORDS]
+        for n in range(2, self.max_phrase_words + 1):
+            grams = (" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+            terms.extend(gram for gram in grams if gram in self.phrases)
+        return terms
+
+    def _keyword_model(self, job_description, resumes):
+        # Plain (sublinear) term frequency, no IDF: each document's vector depends only on
+        # its own text, so a resume scores the same alone as in any batch
+        vectorizer = TfidfVectorizer(analyzer=self.keyword_terms, use_idf=False, sublinear_tf=True)
+        matrix = vectorizer.fit_transform([job_description, *resumes])
+        return vectorizer.get_feature_names_out(), matrix[0], matrix[1:]
+
+    def score(self, job_description, resumes):
+        """
+        One result dict per resume text, in input order, with a 0-100 match_percentage
+        """
+        resumes = list(resumes)
+        if not resumes:
+            return []
+        jd_skills = self.skills([job_description])
+        resume_skills = self.skills(resumes)
+        jd_skills.sort_indices()
+        required = jd_skills.indices
+        matched = resume_skills[:, required].toarray().astype(bool)
+        coverage = matched.mean(axis=1) if len(required) else np.zeros(len(resumes))
+
+        terms, jd_vector, resume_vectors = self._keyword_model(job_description, resumes)
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        similarity = np.asarray((resume_vectors @ jd_vector.T).todense()).ravel()
+
+        # Missing keywords are the JD's own spellings of vocabulary skills, so generic words
+        # ("experience", "plus") and fragments ("ci" of "CI/CD") never show up
+        weights = jd_vector.toarray().ravel()
+        keywords = np.argsort(-weights, kind="stable")
+        keywords = keywords[(weights[keywords] > 0) & np.isin(terms[keywords], list(self.alias_rows))]
+        keywords = keywords[:self.top_keywords]
+        present = resume_vectors[:, keywords].toarray() > 0
+        # A keyword whose skill the resume has under another alias ("k8s" for "kubernetes") isn't missing
+        keyword_skills = self.alias_to_skill[[self.alias_rows[terms[t]] for t in keywords]]
+        present |= (resume_skills @ keyword_skills.T).toarray() > 0
+
+        skill_weight = self.skill_weight if len(required) else 0.0
+        match = 100 * (skill_weight * coverage + (1 - skill_weight) * similarity)
+
+        results = []
+        for i in range(len(resumes)):
+            results.append({
+                "match_percentage": round(float(match[i]), 1),
+                "skill_coverage": round(float(coverage[i]), 3),
+                "similarity": round(float(similarity[i]), 3),
+                "matched_skills": [self.skill_names[s] for s in required[matched[i]]],
+                "missing_skills": [self.skill_names[s] for s in required[~matched[i]]],
+                "missing_keywords": [terms[t] for t in keywords[~present[i]]],
+                "extra_skills": [self.skill_names[s] for s in np.setdiff1d(resume_skills[i].indices, required)],
+            })
+        return results
+
+    def score_one(self, job_description, resume):
+        return self.score(job_description, [resume])[0]
+
+
+@lru_cache(maxsize=4)
+def get_scorer(vocabulary_path=SKILLS_PATH):
+    """
+    Shared scorer per vocabulary file, so the vocabulary is parsed once per process
+    """
+    return ATSScorer(vocabulary_path)
+
+
+def resume_text(pdf_content):
+    """
+    Plain text of the resume parts built by ats_tracker.resume_parts; rendered
+    (scanned) pages have no text and are skipped
+    """
+    return "\n".join(part for part in pdf_content if isinstance(part, str))
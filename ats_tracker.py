@@ -4,11 +4,53 @@ import streamlit as st
 import os
 import io
 import base64
-from PIL import Image
+import hashlib
+from PIL import Image, ImageStat
 import pdf2image
-import google.generativeai as genai
+import fitz  # PyMuPDF for the resume text layer
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from disk_cache import DiskCache, content_key
+import ats_scoring
+import llm_gateway
+import application_tracker
 
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+GEMINI_MODEL = llm_gateway.GEMINI_MODEL
+# Rendered resume pages and Gemini analyses, keyed by hashes of their inputs
+ATS_CACHE_DIR = os.path.join(".cache", "ats")
+ATS_CACHE_MAX_BYTES = int(os.getenv("ATS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+ats_cache = DiskCache(ATS_CACHE_DIR, ATS_CACHE_MAX_BYTES)
+# Resume rendering: rasterize at a bounded DPI, cap the page size in pixels,
+# and lower JPEG quality only as far as needed to fit the payload target
+RENDER_DPI = 120
+RENDER_MAX_SIZE = (1240, 1754)
+RENDER_TARGET_BYTES = 300 * 1024
+RENDER_QUALITY_RANGE = (40, 90)
+# "text" sends the PDF text layer and renders only pages without one; "image" renders every page
+RESUME_MODES = {"text": "📝 Text (image fallback for scanned pages)", "image": "🖼️ Images (all pages)"}
+# Pages with less extractable text than this are treated as scanned
+MIN_PAGE_TEXT_CHARS = 40
+# All resume pages go in one request, capped at this many bytes (text + base64 images)
+RESUME_PAYLOAD_BUDGET = int(os.getenv("ATS_RESUME_PAYLOAD_BYTES", str(1024 * 1024)))
+# Page thumbnails used to skip blank pages (low pixel variance) and repeated pages
+# (identical thumbnail pixels; perceptual hashes can't tell dense text pages apart)
+THUMBNAIL_SIZE = 128
+BLANK_PAGE_STDDEV = 2.0
+# Concurrent Gemini requests in Full Report mode
+FULL_REPORT_WORKERS = int(os.getenv("ATS_FULL_REPORT_WORKERS", "4"))
+# Feature buttons answered by a single ATS_PROMPTS prompt
+PROMPT_FEATURES = {"📄 Resume Analysis": "📄 Tell me About the Resume", "🛠️ Skill Analysis": "🛠️ Skill Gap Analysis",
+                   "📌 Job Fit": "📌 Job Fit Prediction", "📂 ATS Format": "📂 ATS-optimized Formatting",
+                   "🎯 Role Suggestions": "🎯 Job Role-based Suggestions",
+                   "📉 Benchmarking": "📉 Benchmarking Against Competitors",
+                   "😊 Tone Analysis": "😊 Emotional Tone Assessment",
+                   "💬 Interview Prep": "💬 Generate Interview Questions"}
+CUSTOM_FEATURE = "❓ Custom Analysis"
+# Features scored locally by ats_scoring; Gemini is only asked for the optional narrative
+OFFLINE_FEATURES = {"📊 Match Score": "📊 Percentage Match", "🔑 Keywords": "🔑 Resume Keyword Optimization"}
+# Features backed by the local application database rather than the resume
+TRACKER_FEATURES = {"📅 Application Tracker": application_tracker.render_tracker,
+                    "🔗 LinkedIn Import": application_tracker.render_linkedin_import}
 
 def apply_custom_css():
     st.markdown("""
@@ -91,30 +133,328 @@ def apply_custom_css():
         </style>
     """, unsafe_allow_html=True)
 
+ATS_PROMPTS = {
+    "📄 Tell me About the Resume": """
+        You are an experienced HR with Tech Experience in Data Science, Full Stack Web Development, Big Data Engineering,
+        DevOps, or Data Analysis. Review the resume against the job description and provide professional evaluation.
+        Highlight strengths and weaknesses in relation to job requirements.
+    """,
+    "📊 Percentage Match": """
+        As an ATS scanner, evaluate the resume against the job description. 
+        Provide a match percentage, list missing keywords, and share final thoughts.
+    """,
+    "🛠️ Skill Gap Analysis": """
+        Identify missing skills in the resume compared to the job description and suggest relevant courses or certifications.
+    """,
+    "📌 Job Fit Prediction": """
+        Analyze the resume and job description to predict how well the candidate fits the role and company culture.
+    """,
+    "📂 ATS-optimized Formatting": """
+        Evaluate the resume formatting and suggest improvements for better ATS compatibility.
+    """,
+    "🔑 Resume Keyword Optimization": """
+        Analyze missing or weak keywords in the resume compared to the job description.
+    """,
+    "🎯 Job Role-based Suggestions": """
+        Suggest alternative job roles that might be a better fit based on the resume.
+    """,
+    "📉 Benchmarking Against Competitors": """
+        Compare the candidate's resume to other applicants and provide insights into skills and experience.
+    """,
+    "😊 Emotional Tone Assessment": """
+        Analyze the resume's emotional tone and suggest ways to improve the conveyed personality.
+    """,
+    "💬 Generate Interview Questions": """
+        Generate potential interview questions based on the resume and job description.
+    """,
+    "❓ Custom Query": """
+        Provide a custom analysis based on the user’s query related to the uploaded PDF.
+    """
+}
+
+def _part_data(part):
+    # Resume parts are either page text (str) or an inline image dict
+    return part if isinstance(part, str) else part["data"]
+
+def _analysis_key(input, pdf_content, prompt):
+    # Same model, job description, resume and prompt -> same answer; don't pay for it twice
+    return content_key("analysis", GEMINI_MODEL, input, *[_part_data(part) for part in pdf_content], prompt)
+
 def get_gemini_response(input, pdf_content, prompt):
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    response = model.generate_content([input, pdf_content[0], prompt])
-    return response.text
+    key = _analysis_key(input, pdf_content, prompt)
+    cached = ats_cache.get_json(key)
+    if cached is not None:
+        return cached["text"]
 
-def input_pdf_setup(uploaded_file):
-    if uploaded_file is not None:
-        images = pdf2image.convert_from_bytes(uploaded_file.read())
-        first_page = images[0]
+    text = llm_gateway.gemini_generate([input, *pdf_content, prompt], GEMINI_MODEL)
+    ats_cache.set_json(key, {"model": GEMINI_MODEL, "text": text})
+    return text
 
-        img_byte_arr = io.BytesIO()
-        first_page.save(img_byte_arr, format="JPEG")
-        img_byte_arr = img_byte_arr.getvalue()
+def stream_gemini_response(input, pdf_content, prompt, metrics=None):
+    """
+    Yield the response text chunk by chunk as Gemini generates it. If `metrics` is
+    given it is filled with cached / time_to_first_token_seconds / total_seconds.
+    The complete text is stored in the result cache once the stream finishes.
+    """
+    metrics = metrics if metrics is not None else {}
+    start = time.perf_counter()
+    key = _analysis_key(input, pdf_content, prompt)
+    cached = ats_cache.get_json(key)
+    if cached is not None:
+        metrics.update(cached=True, time_to_first_token_seconds=0.0, total_seconds=time.perf_counter() - start)
+        yield cached["text"]
+        return
 
-        pdf_part = [
-            {
-                "mime_type": "image/jpeg",
-                "data": base64.b64encode(img_byte_arr).decode()
-            }
-        ]
+    metrics["cached"] = False
+    chunks = []
+    for text in llm_gateway.gemini_stream([input, *pdf_content, prompt], GEMINI_MODEL):
+        if not text:
+            continue
+        if not chunks:
+            metrics["time_to_first_token_seconds"] = time.perf_counter() - start
+        chunks.append(text)
+        yield text
+    metrics["total_seconds"] = time.perf_counter() - start
+    ats_cache.set_json(key, {"model": GEMINI_MODEL, "text": "".join(chunks)})
+
+def render_streamed_response(title, input, pdf_content, prompt):
+    """
+    Stream a response into the result panel, then show its latency
+    """
+    st.subheader(f"{title} Result:")
+    placeholder = st.empty()
+    metrics = {}
+    text = ""
+    for chunk in stream_gemini_response(input, pdf_content, prompt, metrics):
+        text += chunk
+        placeholder.markdown(text + " ▌")
+    placeholder.markdown(text)
+    if metrics.get("cached"):
+        st.caption("⚡ Served from cache")
+    else:
+        st.caption(f"⏱️ First token after {metrics.get('time_to_first_token_seconds', 0):.2f}s, "
+                   f"complete in {metrics.get('total_seconds', 0):.2f}s")
+    return text
+
+def run_full_report(input, pdf_content, prompt_names, max_workers=FULL_REPORT_WORKERS):
+    """
+    Run several analyses for one resume/JD pair through a bounded thread pool.
+    Yields (name, response, seconds, error) in completion order.
+    """
+    def timed(name):
+        start = time.perf_counter()
+        response = get_gemini_response(input, pdf_content, ATS_PROMPTS[name])
+        return response, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(timed, name): name for name in prompt_names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                response, seconds = future.result()
+                yield name, response, seconds, None
+            except Exception as e:
+                yield name, None, 0.0, e
+
+def encode_jpeg(image, target_bytes=RENDER_TARGET_BYTES, quality_range=RENDER_QUALITY_RANGE):
+    """
+    Highest JPEG quality whose output fits target_bytes (binary search),
+    or the lowest quality in range if none does
+    """
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    low, high = quality_range
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+        if buffer.tell() <= target_bytes:
+            best = buffer.getvalue()
+            low = quality + 1
+        else:
+            high = quality - 1
+    if best is None:
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality_range[0], optimize=True)
+        best = buffer.getvalue()
+    return best
+
+def render_pdf_page(pdf_bytes, page_number=1, dpi=RENDER_DPI, max_size=RENDER_MAX_SIZE,
+                    target_bytes=RENDER_TARGET_BYTES):
+    """
+    Rasterize a single page (1-based) at bounded resolution and return JPEG bytes
+    """
+    images = pdf2image.convert_from_bytes(pdf_bytes, dpi=dpi, first_page=page_number, last_page=page_number)
+    if not images:
+        raise ValueError(f"PDF has no page {page_number}")
+    page = images[0]
+    page.thumbnail(max_size, Image.LANCZOS)
+    return encode_jpeg(page, target_bytes)
+
+def extract_pdf_text(pdf_bytes):
+    """
+    Text layer of every page, in order (empty strings for scanned pages)
+    """
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [page.get_text() for page in doc]
+
+def page_fingerprints(pdf_bytes, size=THUMBNAIL_SIZE):
+    """
+    (sha256 of the thumbnail pixels, pixel stddev) for every page, from small grayscale
+    thumbnails rendered by PyMuPDF. Only a page repeated exactly shares a digest:
+
+    >>> import random
+    >>> from PIL import ImageDraw
+    >>> words = "experience python managed team developed systems cloud data led".split()
+    >>> doc = fitz.open()
+    >>> for seed in [0, 1, 2, 3, 0]:
+    ...     rng = random.Random(seed)
+    ...     scan = Image.new("L", (1240, 1754), 255)
+    ...     for line in range(80):
+    ...         ImageDraw.Draw(scan).text((60, 60 + line * 20), " ".join(rng.choices(words, k=14)), fill=0)
+    ...     buffer = io.BytesIO()
+    ...     scan.save(buffer, format="PNG")
+    ...     _ = doc.new_page(width=595, height=842).insert_image(fitz.Rect(0, 0, 595, 842), stream=buffer.getvalue())
+    >>> digests = [digest for digest, _ in page_fingerprints(doc.tobytes())]
+    >>> len(set(digests)), digests[4] == digests[0]
+    (4, True)
+    """
+    fingerprints = []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            zoom = size / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+            thumbnail = Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+            fingerprints.append((hashlib.sha256(pixmap.samples).hexdigest(), ImageStat.Stat(thumbnail).stddev[0]))
+    return fingerprints
+
+def pdf_image_part(pdf_bytes, page_number, target_bytes=RENDER_TARGET_BYTES):
+    key = content_key("render", f"page{page_number}", str(RENDER_DPI), str(RENDER_MAX_SIZE),
+                      str(target_bytes), pdf_bytes)
+    img_byte_arr = ats_cache.get(key)
+    if img_byte_arr is None:
+        img_byte_arr = render_pdf_page(pdf_bytes, page_number, target_bytes=target_bytes)
+        ats_cache.set(key, img_byte_arr)
+
+    return {
+        "mime_type": "image/jpeg",
+        "data": base64.b64encode(img_byte_arr).decode()
+    }
 
-        return pdf_part
+def resume_parts(pdf_bytes, mode="text", skipped=None, budget=RESUME_PAYLOAD_BUDGET):
+    """
+    Every useful page of the resume, in order, for a single request. Blank and
+    repeated pages are dropped, and rendered pages share whatever budget the text
+    leaves. If `skipped` is given, (page_number, reason) is appended for each dropped page.
+    """
+    skipped = skipped if skipped is not None else []
+    texts = [text.strip() for text in extract_pdf_text(pdf_bytes)]
+    if mode == "image":
+        texts = [""] * len(texts)
+
+    parts = {}
+    to_render = []
+    seen_texts = set()
+    fingerprints = None
+    seen_hashes = set()
+    for page_number, text in enumerate(texts, start=1):
+        if len(text) >= MIN_PAGE_TEXT_CHARS:
+            if text in seen_texts:
+                skipped.append((page_number, "duplicate page"))
+                continue
+            seen_texts.add(text)
+            parts[page_number] = f"Resume page {page_number}:\n{text}"
+            continue
+        # No usable text layer (scanned page): send the rendered page instead, unless
+        # its thumbnail shows it's blank or a repeat of a page already included
+        if fingerprints is None:
+            fingerprints = page_fingerprints(pdf_bytes)
+        page_hash, stddev = fingerprints[page_number - 1]
+        if stddev < BLANK_PAGE_STDDEV:
+            skipped.append((page_number, "blank page"))
+        elif page_hash in seen_hashes:
+            skipped.append((page_number, "duplicate page"))
+        else:
+            seen_hashes.add(page_hash)
+            to_render.append(page_number)
+
+    used = sum(len(part.encode("utf-8")) for part in parts.values())
+    for remaining, page_number in enumerate(to_render):
+        # Split what's left evenly over the pages still to render; base64 adds a third
+        share = (budget - used) * 3 // 4 // (len(to_render) - remaining)
+        if share <= 0:
+            skipped.append((page_number, "over payload budget"))
+            continue
+        part = pdf_image_part(pdf_bytes, page_number, min(RENDER_TARGET_BYTES, share))
+        if used + len(part["data"]) > budget:
+            # Even the lowest JPEG quality didn't fit
+            skipped.append((page_number, "over payload budget"))
+            continue
+        used += len(part["data"])
+        parts[page_number] = part
+
+    skipped.sort()
+    return [parts[page_number] for page_number in sorted(parts)]
+
+def input_pdf_setup(uploaded_file, mode="text", skipped=None):
+    if uploaded_file is not None:
+        # getvalue() rather than read(): the upload survives reruns, its read position doesn't
+        return resume_parts(uploaded_file.getvalue(), mode, skipped)
     else:
         raise FileNotFoundError("No files uploaded")
+
+def describe_resume_payload(pdf_content):
+    """
+    Which path each page took and how many bytes the resume adds to a request
+    """
+    text_pages = [part for part in pdf_content if isinstance(part, str)]
+    image_pages = [part for part in pdf_content if not isinstance(part, str)]
+    return {
+        "text_pages": len(text_pages),
+        "image_pages": len(image_pages),
+        "payload_bytes": sum(len(part.encode("utf-8")) for part in text_pages)
+                         + sum(len(part["data"]) for part in image_pages),
+    }
+
+def render_offline_score(feature, input_text, pdf_content, stream_responses):
+    """
+    Match score and missing skills/keywords computed locally, with Gemini narrative on request
+    """
+    text = ats_scoring.resume_text(pdf_content)
+    if not input_text.strip():
+        st.info("Paste a job description to score your resume.")
+        return
+    if not text.strip():
+        st.warning("This resume has no text layer (scanned pages), so it can't be scored offline. "
+                   "Use the narrative feedback below instead.")
+    else:
+        result = ats_scoring.get_scorer().score_one(input_text, text)
+        st.subheader(f"{feature} Result:")
+        score_col, coverage_col, similarity_col = st.columns(3)
+        score_col.metric("Match", f"{result['match_percentage']:.0f}%")
+        coverage_col.metric("Skill coverage", f"{result['skill_coverage']:.0%}")
+        similarity_col.metric("Text similarity", f"{result['similarity']:.2f}")
+        st.markdown("**Matched skills:** " + (", ".join(result["matched_skills"]) or "none"))
+        st.markdown("**Missing skills:** " + (", ".join(result["missing_skills"]) or "none"))
+        st.markdown("**Missing keywords:** " + (", ".join(result["missing_keywords"]) or "none"))
+        st.caption("Scored locally from the resume text; no API call was made.")
+
+    prompt = ATS_PROMPTS[OFFLINE_FEATURES[feature]]
+    if st.button("Get narrative feedback from Gemini", key="offline_narrative", use_container_width=True):
+        if stream_responses:
+            render_streamed_response(feature, input_text, pdf_content, prompt)
+        else:
+            with st.spinner('Processing your request...'):
+                response = get_gemini_response(input_text, pdf_content, prompt)
+            st.markdown(f"""
+                <div class="response-section">
+                    <h3>{feature} Feedback</h3>
+                    <div style="margin-top: 1rem;">
+                        {response}
+                    </div>
+                </div>
+            """, unsafe_allow_html=True)
     
 
 # STREAMLIT UI
@@ -153,7 +493,8 @@ def main():
         "💬 Interview Prep": "Generate practice questions",
         "🔗 LinkedIn Import": "Import your LinkedIn profile",
         "📅 Application Tracker": "Track your job applications",
-        "❓ Custom Analysis": "Ask specific questions"
+        "❓ Custom Analysis": "Ask specific questions",
+        "🧾 Full Report": "Run several analyses at once"
     }
 
     # Display features in a 3-column grid
@@ -187,85 +528,100 @@ def main():
 
     uploaded_file = st.file_uploader("Upload your Resume (PDF):", type=["pdf"], key="upload_file_main")
     input_text = st.text_area("Job Description:", key="input_text")
+    resume_mode = st.radio("Send resume as:", list(RESUME_MODES), format_func=RESUME_MODES.get,
+                           horizontal=True, key="resume_mode")
+    stream_responses = st.toggle("Stream responses as they are generated", value=True, key="stream_responses")
+
+    selected_feature = st.session_state.get("selected_feature", None)
 
-    if uploaded_file:
+    if selected_feature in TRACKER_FEATURES:
+        # No accounts yet, so applications are grouped under whatever name the user enters
+        user_id = st.text_input("Your name or email (applications are saved under it):", value="me",
+                                key="tracker_user").strip() or "me"
+        TRACKER_FEATURES[selected_feature](user_id)
+    elif uploaded_file:
         st.markdown("""
             <div class="success-message">
                 ✅ Resume uploaded successfully!
             </div>
         """, unsafe_allow_html=True)        
-        pdf_content = input_pdf_setup(uploaded_file)
-
-        prompts = {
-            "📄 Tell me About the Resume": """
-                You are an experienced HR with Tech Experience in Data Science, Full Stack Web Development, Big Data Engineering,
-                DevOps, or Data Analysis. Review the resume against the job description and provide professional evaluation.
-                Highlight strengths and weaknesses in relation to job requirements.
-            """,
-            "📊 Percentage Match": """
-                As an ATS scanner, evaluate the resume against the job description. 
-                Provide a match percentage, list missing keywords, and share final thoughts.
-            """,
-            "🛠️ Skill Gap Analysis": """
-                Identify missing skills in the resume compared to the job description and suggest relevant courses or certifications.
-            """,
-            "📌 Job Fit Prediction": """
-                Analyze the resume and job description to predict how well the candidate fits the role and company culture.
-            """,
-            "📂 ATS-optimized Formatting": """
-                Evaluate the resume formatting and suggest improvements for better ATS compatibility.
-            """,
-            "🔑 Resume Keyword Optimization": """
-                Analyze missing or weak keywords in the resume compared to the job description.
-            """,
-            "🎯 Job Role-based Suggestions": """
-                Suggest alternative job roles that might be a better fit based on the resume.
-            """,
-            "📉 Benchmarking Against Competitors": """
-                Compare the candidate's resume to other applicants and provide insights into skills and experience.
-            """,
-            "😊 Emotional Tone Assessment": """
-                Analyze the resume's emotional tone and suggest ways to improve the conveyed personality.
-            """,
-            "💬 Generate Interview Questions": """
-                Generate potential interview questions based on the resume and job description.
-            """,
-            "❓ Custom Query": """
-                Provide a custom analysis based on the user’s query related to the uploaded PDF.
-            """
-        }
-
-        selected_feature = st.session_state.get("selected_feature", None)
-
-        if selected_feature and selected_feature in prompts:
-            prompt = prompts[selected_feature]
+        skipped_pages = []
+        pdf_content = input_pdf_setup(uploaded_file, resume_mode, skipped_pages)
+        payload = describe_resume_payload(pdf_content)
+        path = "text" if not payload["image_pages"] else ("image" if not payload["text_pages"] else "text + image")
+        st.caption(f"Resume sent as {path}: {payload['text_pages']} text page(s), "
+                   f"{payload['image_pages']} image page(s), {payload['payload_bytes'] / 1024:.1f} KB per request")
+        if skipped_pages:
+            st.caption("Skipped " + ", ".join(f"page {page} ({reason})" for page, reason in skipped_pages))
+
+        prompts = ATS_PROMPTS
+
+        if selected_feature in PROMPT_FEATURES:
+            prompt = prompts[PROMPT_FEATURES[selected_feature]]
 
             if st.button(f"Analyze with {selected_feature}", key="run_analysis", use_container_width=True):
-                with st.spinner('Processing your request...'):
-                    response = get_gemini_response(input_text, pdf_content, prompt)            
-                st.subheader(f"{selected_feature} Result:")
-                st.markdown(f"""
-                    <div class="response-section">
-                        <h3>{selected_feature} Results</h3>
-                        <div style="margin-top: 1rem;">
-                            {response}
+                if stream_responses:
+                    render_streamed_response(selected_feature, input_text, pdf_content, prompt)
+                else:
+                    with st.spinner('Processing your request...'):
+                        response = get_gemini_response(input_text, pdf_content, prompt)            
+                    st.subheader(f"{selected_feature} Result:")
+                    st.markdown(f"""
+                        <div class="response-section">
+                            <h3>{selected_feature} Results</h3>
+                            <div style="margin-top: 1rem;">
+                                {response}
+                            </div>
                         </div>
-                    </div>
-                """, unsafe_allow_html=True)
-        elif selected_feature == "❓ Custom Query":
+                    """, unsafe_allow_html=True)
+        elif selected_feature in OFFLINE_FEATURES:
+            render_offline_score(selected_feature, input_text, pdf_content, stream_responses)
+        elif selected_feature == "🧾 Full Report":
+            report_options = [name for name in prompts if name != "❓ Custom Query"]
+            selected_analyses = st.multiselect("Analyses to include:", report_options, default=report_options,
+                                               key="full_report_analyses")
+            if st.button("Generate Full Report", key="run_full_report", use_container_width=True):
+                # One placeholder per section, filled in as each analysis completes
+                sections = {name: st.empty() for name in selected_analyses}
+                for name, placeholder in sections.items():
+                    placeholder.info(f"{name}: waiting...")
+                start = time.perf_counter()
+                total_latency = 0.0
+                for name, response, seconds, error in run_full_report(input_text, pdf_content, selected_analyses):
+                    if error is not None:
+                        sections[name].error(f"{name} failed: {error}")
+                        continue
+                    total_latency += seconds
+                    with sections[name].container():
+                        st.markdown(f"""
+                            <div class="response-section">
+                                <h3>{name} Results</h3>
+                                <div style="margin-top: 1rem;">
+                                    {response}
+                                </div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                        st.caption(f"⏱️ {seconds:.1f}s")
+                wall_time = time.perf_counter() - start
+                st.success(f"Full report ready in {wall_time:.1f}s "
+                           f"(sum of individual analyses: {total_latency:.1f}s)")
+        elif selected_feature == CUSTOM_FEATURE:
             custom_query = st.text_area("Enter your custom query:", key="custom_query_input")
             if st.button("Submit Query", key="submit_custom_query"):
-                with st.spinner('Processing...'):
-                    response = get_gemini_response(input_text, pdf_content, custom_query)
-                st.subheader("Response to Your Query:")
-                st.markdown(f"""
-                    <div class="response-section">
-                        <h3>{selected_feature} Results</h3>
-                        <div style="margin-top: 1rem;">
-                            {response}
+                if stream_responses:
+                    render_streamed_response("Custom Query", input_text, pdf_content, custom_query)
+                else:
+                    with st.spinner('Processing...'):
+                        response = get_gemini_response(input_text, pdf_content, custom_query)
+                    st.subheader("Response to Your Query:")
+                    st.markdown(f"""
+                        <div class="response-section">
+                            <h3>{selected_feature} Results</h3>
+                            <div style="margin-top: 1rem;">
+                                {response}
+                            </div>
                         </div>
-                    </div>
-                """, unsafe_allow_html=True)
+                    """, unsafe_allow_html=True)
     else:
         st.info("Please upload a resume to get started.")
 
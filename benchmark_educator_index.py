@@ -0,0 +1,261 @@
+"""
+Benchmarks for the educator search index.
+
+    # recall@k vs latency of the compressed index modes against the flat index
+    python benchmark_educator_index.py recall --rows 200000 --k 10 --nprobe 1 4 16 64
+
+    # ingest / embedding / build / memory / latency at several dataset sizes
+    python benchmark_educator_index.py scale --rows 1000 100000 1000000 --output report.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import educator_index
+
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Isha",
+               "Krish", "Meera", "Aditya", "Neha", "Siddharth", "Pooja", "Raj", "Divya", "Karan", "Riya"]
+LAST_NAMES = ["Sharma", "Patel", "Naik", "Iyer", "Reddy", "Gupta", "Malhotra", "Verma", "Joshi", "Kapoor",
+              "Mehta", "Rao", "Singh", "Desai", "Nair", "Chopra", "Bose", "Kulkarni", "Menon", "Pillai"]
+EXPERTISE = ["Machine Learning", "Development", "Data Science", "Blockchain", "Cloud Computing", "DevOps",
+             "Cyber Security", "Web Development", "Mobile Development", "Deep Learning", "Big Data",
+             "UX/UI Design", "Game Development", "Artificial Intelligence", "Data Engineering", "Finance"]
+FOCUS = ["real-time data models", "AI-powered systems", "automation tools", "scalable web platforms",
+         "predictive analytics", "secure distributed systems", "cloud-native architectures"]
+
+
+def synthetic_mentors(rows, seed=0, start=0):
+    """
+    Mentor rows with the same columns as educators_mentors_dataset_.csv, built column-wise
+    """
+    rng = np.random.default_rng(seed + start)
+    first = pd.Series(np.asarray(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), rows)])
+    last = pd.Series(np.asarray(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), rows)])
+    serial = pd.Series(np.arange(start, start + rows)).astype(str)
+    handle = (first + last).str.lower() + serial
+    expertise = pd.Series(np.asarray(EXPERTISE)[rng.integers(0, len(EXPERTISE), rows)])
+    focus = pd.Series(np.asarray(FOCUS)[rng.integers(0, len(FOCUS), rows)])
+    years = rng.integers(3, 30, rows)
+    mentored = rng.integers(20, 600, rows)
+    placed = (mentored * rng.uniform(0.2, 0.9, rows)).astype(int)
+    name = first + " " + last
+    return pd.DataFrame({
+        "Name": name,
+        "Website": "https://" + handle + ".com",
+        "Email": handle + "@example.com",
+        "Expertise": expertise,
+        "Years_of_Experience": years,
+        "Students_Mentored": mentored,
+        "Successful_Places": placed,
+        "about": name + " has " + pd.Series(years).astype(str) + " years of experience in "
+                 + expertise.str.lower() + ", mentoring " + pd.Series(mentored).astype(str)
+                 + " students. Known for work on " + focus + ".",
+    })
+
+
+def write_synthetic_csv(path, rows, seed=0, chunk_rows=100_000):
+    """
+    Write `rows` synthetic mentors to `path` in chunks, so memory stays bounded
+    """
+    for start in range(0, rows, chunk_rows):
+        chunk = synthetic_mentors(min(chunk_rows, rows - start), seed, start)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def synthetic_embeddings(rows, dimension=384, clusters=64, seed=0):
+    """
+    Clustered unit vectors, closer to real sentence embeddings than uniform noise
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, rows)] + 0.5 * rng.standard_normal((rows, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def recall_at_k(truth, found, k):
+    """
+    Fraction of the exact top-k neighbours that the approximate search also returned
+    """
+    hits = sum(len(set(t[:k]) & set(f[:k])) for t, f in zip(truth, found))
+    return hits / float(len(truth) * k)
+
+
+def _time_search(index, queries, k):
+    latencies = []
+    ids = []
+    for query in queries:
+        start = time.perf_counter()
+        _, found = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+        ids.append(found[0])
+    return np.asarray(ids), np.asarray(latencies) * 1000
+
+
+def _latency_summary(latencies_ms):
+    return {
+        f"latency_ms_p{p}": round(float(np.percentile(latencies_ms, p)), 4) for p in (50, 95, 99)
+    }
+
+
+def benchmark_index_types(embeddings, queries, k=10, index_types=educator_index.INDEX_TYPES, nprobes=(1, 4, 16, 64)):
+    """
+    Build every index type over `embeddings` and measure it against exact (flat) search.
+    Returns one dict per (index type, nprobe) configuration; "filtered_ok" says whether a
+    search restricted to every other row (as metadata filters do) returned only those rows.
+    """
+    ids = np.arange(len(embeddings), dtype=np.int64)
+    flat = educator_index.build_index(embeddings, ids, "flat")
+    truth, _ = _time_search(flat, queries, k)
+
+    report = []
+    for index_type in index_types:
+        start = time.perf_counter()
+        index = educator_index.build_index(embeddings, ids, index_type)
+        build_seconds = time.perf_counter() - start
+        resolved = educator_index.resolve_index_type(index_type, len(embeddings))
+        for nprobe in (nprobes if resolved == "ivfpq" else (None,)):
+            if nprobe is not None:
+                educator_index.set_nprobe(index, nprobe)
+            found, latencies_ms = _time_search(index, queries, k)
+            allowed = ids[::2]
+            params = educator_index.search_params(index, allowed, nprobe or educator_index.NPROBE)
+            _, filtered = index.search(np.ascontiguousarray(queries[:10]), k, params=params)
+            report.append({
+                "index_type": index_type,
+                "resolved_index_type": resolved,
+                "nprobe": nprobe,
+                "rows": len(embeddings),
+                "k": k,
+                "build_seconds": round(build_seconds, 4),
+                "memory_bytes": educator_index.index_memory_bytes(index),
+                f"recall@{k}": round(recall_at_k(truth, found, k), 4),
+                "filtered_ok": bool(np.isin(filtered[filtered >= 0], allowed).all()),
+                **_latency_summary(latencies_ms),
+            })
+    return report
+
+
+def benchmark_ingest(rows, work_dir, seed=0):
+    csv_path = os.path.join(work_dir, f"mentors_{rows}.csv")
+    write_synthetic_csv(csv_path, rows, seed)
+
+    start = time.perf_counter()
+    csv_hash = educator_index.file_hash(csv_path)
+    arrow_path = educator_index.ingest_cache_path(csv_path, csv_hash, work_dir)
+    educator_index.ingest_csv(csv_path, arrow_path)
+    ingest_seconds = time.perf_counter() - start
+
+    # Loads the columnar cache written above (memory-mapped), as the app does on later runs
+    start = time.perf_counter()
+    df = educator_index.read_educators(csv_path, csv_hash, ingest_dir=work_dir)
+    load_seconds = time.perf_counter() - start
+    result = {
+        "csv_bytes": os.path.getsize(csv_path),
+        "arrow_bytes": os.path.getsize(arrow_path),
+        "ingest_seconds": round(ingest_seconds, 4),
+        "ingest_rows_per_second": round(rows / ingest_seconds, 1),
+        "cached_load_seconds": round(load_seconds, 4),
+        "dataframe_bytes": int(df.memory_usage(deep=True).sum()),
+    }
+    return df, result
+
+
+def benchmark_embedding(model, texts, rows):
+    """
+    Embedding throughput on a sample, extrapolated to the full dataset size
+    """
+    start = time.perf_counter()
+    educator_index.embed(model, texts)
+    seconds = time.perf_counter() - start
+    rate = len(texts) / seconds
+    return {
+        "sample_rows": len(texts),
+        "rows_per_second": round(rate, 1),
+        "estimated_seconds_full": round(rows / rate, 1),
+    }
+
+
+def benchmark_scale(sizes, index_types=educator_index.INDEX_TYPES, k=10, queries=200, nprobe=educator_index.NPROBE,
+                    embed_sample=2000, work_dir=None, seed=0):
+    """
+    Ingest, embedding, index build, memory and query latency at each dataset size.
+    Index measurements use clustered synthetic vectors so 1M-row runs don't need hours
+    of transformer inference; embedding cost is measured on a sample and extrapolated.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(educator_index.MODEL_NAME)
+    results = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        for rows in sizes:
+            df, ingest = benchmark_ingest(rows, tmp, seed)
+            embedding = benchmark_embedding(model, df["combined_text"].iloc[:embed_sample], rows)
+            del df
+
+            vectors = synthetic_embeddings(rows + queries, model.get_sentence_embedding_dimension(), seed=seed)
+            report = benchmark_index_types(vectors[:rows], vectors[rows:], k, index_types, (nprobe,))
+            del vectors
+            results.append({"rows": rows, "ingest": ingest, "embedding": embedding, "indexes": report})
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "faiss": educator_index.faiss.__version__,
+        "pyarrow": pa.__version__,
+        "model": educator_index.MODEL_NAME,
+        "k": k,
+        "queries": queries,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Educator search index benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recall = commands.add_parser("recall", help="recall@k vs latency against the flat index")
+    recall.add_argument("--rows", type=int, default=100_000, help="synthetic vectors to index")
+    recall.add_argument("--queries", type=int, default=200)
+    recall.add_argument("--k", type=int, default=10)
+    recall.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    recall.add_argument("--index-types", nargs="+", default=list(educator_index.INDEX_TYPES))
+    recall.add_argument("--seed", type=int, default=0)
+
+    scale = commands.add_parser("scale", help="ingest/embed/build/memory/latency at several sizes")
+    scale.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    scale.add_argument("--queries", type=int, default=200)
+    scale.add_argument("--k", type=int, default=10)
+    scale.add_argument("--nprobe", type=int, default=educator_index.NPROBE)
+    scale.add_argument("--index-types", nargs="+", default=list(educator_index.INDEX_TYPES))
+    scale.add_argument("--embed-sample", type=int, default=2000)
+    scale.add_argument("--work-dir", help="where to write the generated CSVs (default: system temp)")
+    scale.add_argument("--output", help="write the JSON report here instead of stdout")
+    scale.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "recall":
+        vectors = synthetic_embeddings(args.rows + args.queries, seed=args.seed)
+        embeddings, queries = vectors[:args.rows], vectors[args.rows:]
+        report = benchmark_index_types(embeddings, queries, args.k, args.index_types, args.nprobe)
+    else:
+        report = benchmark_scale(args.rows, args.index_types, args.k, args.queries, args.nprobe,
+                                 args.embed_sample, args.work_dir, args.seed)
+
+    output = json.dumps(report, indent=2)
+    if getattr(args, "output", None):
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
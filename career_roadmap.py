@@ -1,11 +1,11 @@
 import os
 import streamlit as st
-from langchain_groq import ChatGroq
 from langchain.agents import initialize_agent, AgentType
 from langchain.tools import Tool
 from dotenv import load_dotenv
 from datetime import datetime
 import json
+import llm_gateway
 
 def main():
     # Load API key from environment variable
@@ -18,8 +18,8 @@ def main():
     if not GROQ_API_KEY:
         raise ValueError("GROQ_API_KEY is not set. Please add it to your environment variables.")
 
-    # Initialize LLM model with API key
-    llm = ChatGroq(model_name="mixtral-8x7b-32768", groq_api_key=GROQ_API_KEY, temperature=0.5)
+    # Shared client from the gateway, so reruns don't build a new one
+    llm = llm_gateway.get_chat_groq(temperature=0.5)
 
     # Custom CSS for better UI
     st.markdown("""
@@ -1,22 +1,16 @@
 import streamlit as st
-import os
-from langchain_groq import ChatGroq
 from dotenv import load_dotenv
 import random
 from datetime import datetime, timedelta
+import llm_gateway
 
 # Load environment variables
 load_dotenv()
 
 class DiscussionRoom:
     def __init__(self):
-        # Initialize AI model
-        GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-        self.llm = ChatGroq(
-            model_name="mixtral-8x7b-32768", 
-            groq_api_key=GROQ_API_KEY, 
-            temperature=0.7
-        )
+        # Shared AI model from the gateway
+        self.llm = llm_gateway.get_chat_groq(temperature=0.7)
 
     def generate_custom_css(self):
         return """
@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+
+
+def content_key(*parts):
+    """
+    Stable key for a tuple of str/bytes parts. Each part is hashed on its own so
+    ("ab", "c") and ("a", "bc") can't collide.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Content-addressed file cache with a total size limit. Reads refresh a file's
+    mtime, and the least recently used files are evicted once the limit is exceeded.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _path(self, key):
+        # Shard by prefix so no single directory grows huge
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def set(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_json(self, key):
+        data = self.get(key)
+        return None if data is None else json.loads(data.decode("utf-8"))
+
+    def set_json(self, key, value):
+        self.set(key, json.dumps(value).encode("utf-8"))
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Oldest first, down to 90% of the limit so we don't evict on every write
+        target = int(self.max_bytes * 0.9)
+        for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            return {"directory": self.directory, "bytes": self._size, "max_bytes": self.max_bytes}
@@ -0,0 +1,783 @@
+import os
+import re
+import sys
+import json
+import time
+import codecs
+import hashlib
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import faiss
+from cachetools import TTLCache
+from sentence_transformers import SentenceTransformer
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+INDEX_DIR = os.path.join(".cache", "educator_index")
+# Columnar (Arrow IPC) copies of ingested CSVs, keyed by CSV content hash
+INGEST_DIR = os.path.join(".cache", "educators")
+# Bumped when ingest derives columns differently, so older cache files aren't reused
+INGEST_VERSION = 2
+CHUNK_ROWS = 50_000
+NUMERIC_COLUMNS = ["Years_of_Experience", "Students_Mentored", "Successful_Places"]
+# Stable per-mentor key used to detect added/changed/removed rows between CSV versions
+KEY_COLUMN = "Email"
+# Rows with a blank key are identified by these instead, so they don't all collide into one id
+FALLBACK_KEY_COLUMNS = ["Name", "Website"]
+# "flat" (exact), "ivfpq" (IVF + product quantization) or "sq8" (int8 scalar quantization)
+INDEX_TYPE = os.getenv("EDUCATOR_INDEX_TYPE", "flat")
+INDEX_TYPES = ("flat", "ivfpq", "sq8")
+# IVF lists scanned per query; higher is slower but closer to exact
+NPROBE = int(os.getenv("EDUCATOR_INDEX_NPROBE", "16"))
+# IVF needs enough vectors to train its coarse quantizer and PQ codebooks
+MIN_IVF_TRAIN_ROWS = 10_000
+# Embeddings are unit-length and indexed by inner product, so search scores are cosine similarities
+METRIC = "cosine"
+# Shared query caches: normalized query -> embedding, and search -> ranked results
+QUERY_CACHE_SIZE = int(os.getenv("EDUCATOR_QUERY_CACHE_SIZE", "4096"))
+QUERY_CACHE_TTL = int(os.getenv("EDUCATOR_QUERY_CACHE_TTL", "3600"))
+
+
+def file_hash(file_path, chunk_size=1 << 20):
+    """
+    Content hash of a file, read in chunks so large exports don't need to fit in memory
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash64(values):
+    # Vectorized 64-bit hash, masked to a non-negative int64 so it's a valid FAISS id
+    hashed = pd.util.hash_pandas_object(pd.Series(values, dtype=object).astype(str), index=False)
+    return (hashed.to_numpy(np.uint64) & np.uint64(0x7FFFFFFFFFFFFFFF)).astype(np.int64)
+
+
+def detect_encoding(csv_path, sample_bytes=1 << 20):
+    """
+    utf-8 if the head of the file decodes cleanly, else cp1252 (what Excel exports);
+    latin1 turns cp1252 curly quotes into control characters
+    """
+    with open(csv_path, "rb") as f:
+        head = f.read(sample_bytes)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+def _prepare_chunk(chunk):
+    """
+    Normalize one CSV chunk and derive the search fields, column-wise
+    """
+    source_columns = list(chunk.columns)
+    for column in source_columns:
+        if column in NUMERIC_COLUMNS:
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce").round().astype("Int64")
+        else:
+            chunk[column] = chunk[column].fillna("").astype(str).str.normalize("NFKC").str.strip()
+
+    text = chunk[source_columns[0]].astype(str)
+    for column in source_columns[1:]:
+        text = text + " " + chunk[column].astype(str).replace("<NA>", "")
+    chunk["combined_text"] = text.str.replace(r"\s+", " ", regex=True).str.strip()
+    key = chunk[KEY_COLUMN].str.lower()
+    fallback = chunk[FALLBACK_KEY_COLUMNS[0]].astype(str)
+    for column in FALLBACK_KEY_COLUMNS[1:]:
+        fallback = fallback + "|" + chunk[column].astype(str)
+    # Prefixed so a fallback key can never equal a real email
+    key = key.where(key != "", "row:" + fallback.str.lower())
+    chunk["row_id"] = _hash64(key)
+    chunk["content_hash"] = _hash64(chunk["combined_text"])
+    return chunk
+
+
+def ingest_csv(csv_path, out_path, chunk_rows=CHUNK_ROWS):
+    """
+    Stream the CSV in chunks into an Arrow IPC file, so memory stays bounded by
+    the chunk size however large the export is
+    """
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    encoding = detect_encoding(csv_path)
+    writer = None
+    schema = None
+    try:
+        reader = pd.read_csv(csv_path, encoding=encoding, encoding_errors="replace",
+                             chunksize=chunk_rows, dtype=str, keep_default_na=False, na_values=[""])
+        for chunk in reader:
+            chunk = _prepare_chunk(chunk)
+            if writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                writer = pa.ipc.new_file(tmp_path, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, out_path)
+
+
+def ingest_cache_path(csv_path, csv_hash, ingest_dir=INGEST_DIR):
+    # Prefixed by the CSV's location, so older versions of the same CSV can be pruned
+    path_key = hashlib.sha256(os.path.abspath(csv_path).encode()).hexdigest()[:12]
+    return os.path.join(ingest_dir, f"{path_key}-{csv_hash[:16]}-v{INGEST_VERSION}.arrow")
+
+
+def prune_ingest_cache(csv_path, keep_path, ingest_dir=INGEST_DIR):
+    """
+    Remove columnar copies of earlier versions of `csv_path`, and unprefixed ones
+    from before cache files were keyed by location
+    """
+    prefix = os.path.basename(keep_path).split("-")[0] + "-"
+    for name in os.listdir(ingest_dir):
+        path = os.path.join(ingest_dir, name)
+        stale = name.startswith(prefix) or re.fullmatch(r"[0-9a-f]{16}\.arrow", name)
+        if stale and name.endswith(".arrow") and path != keep_path:
+            try:
+                os.remove(path)
+            except OSError:
+                # Still memory-mapped somewhere (Windows); the next ingest retries
+                pass
+
+
+def _arrow_strings(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def read_educators(csv_path, csv_hash=None, ingest_dir=INGEST_DIR):
+    """
+    Load the educators table from its columnar cache (memory-mapped), ingesting the CSV first
+    when this version of it hasn't been seen before. Text columns stay Arrow-backed, so they
+    are read straight from the mapped file instead of being copied into Python strings.
+    """
+    csv_hash = csv_hash or file_hash(csv_path)
+    cache_path = ingest_cache_path(csv_path, csv_hash, ingest_dir)
+    if not os.path.exists(cache_path):
+        ingest_csv(csv_path, cache_path)
+        prune_ingest_cache(csv_path, cache_path, ingest_dir)
+    # The mapping stays alive for as long as the columns reference it
+    source = pa.memory_map(cache_path, "r")
+    df = pa.ipc.open_file(source).read_all().to_pandas(types_mapper=_arrow_strings)
+    # One row per mentor; a later row for the same key replaces the earlier one
+    duplicated = df["row_id"].duplicated(keep="last").to_numpy()
+    if duplicated.any():
+        warnings.warn(f"{csv_path}: dropped {int(duplicated.sum())} earlier row(s) repeating a mentor's "
+                      f"{KEY_COLUMN} (or {' + '.join(FALLBACK_KEY_COLUMNS)} when it is blank)")
+        df = df[~duplicated].reset_index(drop=True)
+    return df
+
+
+def embed(model, texts, batch_size=64):
+    return np.asarray(model.encode(list(texts), batch_size=batch_size, normalize_embeddings=True),
+                      dtype=np.float32)
+
+
+def resolve_index_type(index_type, n_rows):
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {index_type!r}; expected one of {INDEX_TYPES}")
+    if index_type == "ivfpq" and n_rows < MIN_IVF_TRAIN_ROWS:
+        # Too few rows to train IVF-PQ; a flat scan is faster at this size anyway
+        return "flat"
+    return index_type
+
+
+def _pq_subquantizers(dimension):
+    # ~8 dims per sub-quantizer, rounded down to a divisor of the dimension
+    m = max(1, dimension // 8)
+    while dimension % m:
+        m -= 1
+    return m
+
+
+def make_index(dimension, n_rows, index_type=INDEX_TYPE):
+    """
+    Empty (untrained) index for `index_type`, wrapped so vectors are keyed by row id
+    """
+    index_type = resolve_index_type(index_type, n_rows)
+    if index_type == "ivfpq":
+        nlist = int(min(4 * np.sqrt(n_rows), n_rows // 39))
+        inner = faiss.IndexIVFPQ(faiss.IndexFlatIP(dimension), dimension, nlist,
+                                 _pq_subquantizers(dimension), 8, faiss.METRIC_INNER_PRODUCT)
+    elif index_type == "sq8":
+        inner = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit,
+                                           faiss.METRIC_INNER_PRODUCT)
+    else:
+        inner = faiss.IndexFlatIP(dimension)
+    # IDMap2 keys vectors by row id, so rows can be removed or replaced without a rebuild
+    return faiss.IndexIDMap2(inner), index_type
+
+
+def set_nprobe(index, nprobe):
+    try:
+        faiss.extract_index_ivf(index).nprobe = nprobe
+    except RuntimeError:
+        # Not an IVF index
+        pass
+
+
+def build_index(embeddings, ids, index_type=INDEX_TYPE, nprobe=NPROBE):
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    index, index_type = make_index(embeddings.shape[1], len(ids), index_type)
+    if not index.is_trained:
+        index.train(embeddings)
+    set_nprobe(index, nprobe)
+    if len(ids):
+        index.add_with_ids(embeddings, np.asarray(ids, dtype=np.int64))
+    return index
+
+
+def index_memory_bytes(index):
+    """
+    Approximate size from the vector count and per-vector code size. Serializing the
+    index would copy all of it and page in every memory-mapped list.
+    """
+    inner = faiss.downcast_index(index.index)
+    # Codes plus the row-id map
+    total = index.ntotal * (getattr(inner, "code_size", index.d * 4) + 8)
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return int(total)
+    # Ids stored next to each code in the inverted lists, and the coarse centroids
+    total += index.ntotal * 8 + ivf.nlist * index.d * 4
+    if hasattr(inner, "pq"):
+        total += inner.pq.M * inner.pq.ksub * inner.pq.dsub * 4
+    return int(total)
+
+
+def search_params(index, allowed_ids, nprobe=NPROBE):
+    """
+    Search parameters restricting `index` to `allowed_ids`. IVF indexes reject plain
+    SearchParameters, so they get SearchParametersIVF carrying nprobe.
+    """
+    selector = faiss.IDSelectorBatch(np.asarray(allowed_ids, dtype=np.int64))
+    try:
+        faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return faiss.SearchParameters(sel=selector)
+    return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+
+
+def _artifact_paths(model_name=MODEL_NAME, index_dir=INDEX_DIR, index_type=INDEX_TYPE):
+    base = os.path.join(index_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name), index_type)
+    return {
+        "dir": base,
+        "index": os.path.join(base, "index.faiss"),
+        "embeddings": os.path.join(base, "embeddings.npy"),
+        "row_ids": os.path.join(base, "row_ids.npy"),
+        "content_hashes": os.path.join(base, "content_hashes.npy"),
+        "meta": os.path.join(base, "meta.json"),
+    }
+
+
+def _write_replacing(path, write):
+    """
+    Write via a temp file in the same directory and rename it over `path`. A live
+    memory map of the old file keeps its inode instead of seeing it truncated.
+    """
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _save_array(path, array):
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+
+    _write_replacing(path, write)
+
+
+def save_index(index, embeddings, row_ids, content_hashes, csv_hash,
+               model_name=MODEL_NAME, index_dir=INDEX_DIR, index_type=INDEX_TYPE, resolved_type=None):
+    """
+    Write the FAISS index, embedding matrix and row-id mapping under the configured
+    `index_type`; meta.json records the type actually built (see resolve_index_type).
+    Every file is replaced rather than overwritten, since the previous artifact may
+    still be memory-mapped by searches in flight. meta.json is written last so a
+    half-written artifact is never picked up.
+    """
+    paths = _artifact_paths(model_name, index_dir, index_type)
+    os.makedirs(paths["dir"], exist_ok=True)
+    if os.path.exists(paths["meta"]):
+        os.remove(paths["meta"])
+    _write_replacing(paths["index"], lambda tmp_path: faiss.write_index(index, tmp_path))
+    _save_array(paths["embeddings"], np.ascontiguousarray(embeddings, dtype=np.float32))
+    _save_array(paths["row_ids"], np.asarray(row_ids, dtype=np.int64))
+    _save_array(paths["content_hashes"], np.asarray(content_hashes, dtype=np.int64))
+    meta = {"csv_hash": csv_hash, "model_name": model_name, "metric": METRIC, "rows": int(len(row_ids)),
+            "dimension": int(embeddings.shape[1]), "index_type": resolved_type or index_type}
+
+    def write_meta(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+
+    _write_replacing(paths["meta"], write_meta)
+
+
+def load_index(model_name=MODEL_NAME, index_dir=INDEX_DIR, mmap=True, index_type=INDEX_TYPE):
+    """
+    Load a persisted artifact (memory-mapped by default), or return None if it doesn't exist
+    """
+    paths = _artifact_paths(model_name, index_dir, index_type)
+    if not os.path.exists(paths["meta"]):
+        return None
+    with open(paths["meta"]) as f:
+        meta = json.load(f)
+    index = None
+    if mmap:
+        try:
+            index = faiss.read_index(paths["index"], faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            # Older faiss builds can't mmap every index type
+            pass
+    if index is None:
+        index = faiss.read_index(paths["index"])
+    mmap_mode = "r" if mmap else None
+    return {
+        "meta": meta,
+        "index": index,
+        "embeddings": np.load(paths["embeddings"], mmap_mode=mmap_mode),
+        "row_ids": np.load(paths["row_ids"], mmap_mode=mmap_mode),
+        "content_hashes": np.load(paths["content_hashes"], mmap_mode=mmap_mode),
+    }
+
+
+def diff_rows(old_ids, old_hashes, new_ids, new_hashes):
+    """
+    Compare stored rows to the current CSV by row id.
+    Returns (added, changed, removed) id arrays.
+    """
+    old = pd.Series(np.asarray(old_hashes), index=np.asarray(old_ids))
+    new = pd.Series(np.asarray(new_hashes), index=np.asarray(new_ids))
+    common = new.index.intersection(old.index)
+    changed = common[new.loc[common].values != old.loc[common].values]
+    added = new.index.difference(old.index)
+    removed = old.index.difference(new.index)
+    return added.to_numpy(np.int64), changed.to_numpy(np.int64), removed.to_numpy(np.int64)
+
+
+def sync_index(df, model, csv_hash, stored=None, model_name=MODEL_NAME, index_dir=INDEX_DIR,
+               index_type=INDEX_TYPE):
+    """
+    Bring the persisted index in line with `df`, embedding only added and changed rows.
+    Returns (index, embeddings, row_ids, summary) where summary counts the delta.
+    Quantized indexes keep their trained codebooks; new rows are encoded with them.
+    """
+    if stored is None:
+        embeddings = embed(model, df["combined_text"])
+        row_ids = df["row_id"].to_numpy(np.int64)
+        content_hashes = df["content_hash"].to_numpy(np.int64)
+        index = build_index(embeddings, row_ids, index_type)
+        save_index(index, embeddings, row_ids, content_hashes, csv_hash, model_name, index_dir, index_type,
+                   resolve_index_type(index_type, len(row_ids)))
+        return index, embeddings, row_ids, {"added": len(df), "changed": 0, "removed": 0, "full_rebuild": True}
+
+    index = stored["index"]
+    old_ids = np.asarray(stored["row_ids"])
+    added, changed, removed = diff_rows(
+        old_ids, stored["content_hashes"], df["row_id"].to_numpy(np.int64), df["content_hash"].to_numpy(np.int64))
+
+    # Drop stale vectors, then append fresh ones for new and edited rows
+    stale = np.concatenate([changed, removed])
+    keep = ~np.isin(old_ids, stale)
+    if len(stale):
+        index.remove_ids(stale)
+    fresh = df[df["row_id"].isin(np.concatenate([added, changed]))]
+    if len(fresh):
+        fresh_embeddings = embed(model, fresh["combined_text"])
+        index.add_with_ids(fresh_embeddings, fresh["row_id"].to_numpy(np.int64))
+    else:
+        fresh_embeddings = np.empty((0, index.d), dtype=np.float32)
+
+    embeddings = np.concatenate([np.asarray(stored["embeddings"])[keep], fresh_embeddings])
+    row_ids = np.concatenate([old_ids[keep], fresh["row_id"].to_numpy(np.int64)])
+    content_hashes = np.concatenate([np.asarray(stored["content_hashes"])[keep],
+                                     fresh["content_hash"].to_numpy(np.int64)])
+    save_index(index, embeddings, row_ids, content_hashes, csv_hash, model_name, index_dir, index_type,
+               stored["meta"]["index_type"])
+    summary = {"added": len(added), "changed": len(changed), "removed": len(removed), "full_rebuild": False}
+    return index, embeddings, row_ids, summary
+
+
+def load_or_build(csv_path, model_name=MODEL_NAME, index_dir=INDEX_DIR, model=None,
+                  index_type=INDEX_TYPE, nprobe=NPROBE):
+    """
+    Return (df, index, model, embeddings, row_ids, summary, csv_hash). The persisted artifact
+    is loaded as-is when the CSV is unchanged, and updated incrementally otherwise.
+    """
+    csv_hash = file_hash(csv_path)
+    df = read_educators(csv_path, csv_hash)
+    if model is None:
+        model = SentenceTransformer(model_name)
+
+    stored = load_index(model_name, index_dir, index_type=index_type)
+    if stored is not None and stored["meta"].get("metric") != METRIC:
+        # Built with a different scoring metric; vectors and index need a full rebuild
+        stored = None
+    if stored is not None and stored["meta"].get("index_type") != resolve_index_type(index_type, len(df)):
+        # e.g. an "ivfpq" index built flat while the data was too small to train, which has now grown
+        stored = None
+    if stored is not None and stored["meta"]["csv_hash"] == csv_hash:
+        summary = {"added": 0, "changed": 0, "removed": 0, "full_rebuild": False}
+        set_nprobe(stored["index"], nprobe)
+        return df, stored["index"], model, stored["embeddings"], stored["row_ids"], summary, csv_hash
+
+    if stored is not None:
+        # Reload writable; a memory-mapped index can't be modified in place
+        stored = load_index(model_name, index_dir, mmap=False, index_type=index_type)
+    index, embeddings, row_ids, summary = sync_index(
+        df, model, csv_hash, stored, model_name, index_dir, index_type)
+    set_nprobe(index, nprobe)
+    return df, index, model, embeddings, row_ids, summary, csv_hash
+
+
+RESULT_COLUMNS = ["Name", "Website", "Email", "Expertise", "Years_of_Experience",
+                  "Students_Mentored", "Successful_Places"]
+
+
+def filter_mask(df, filters):
+    """
+    Boolean mask of rows matching `filters`, a dict of column -> condition where a
+    condition is a scalar (equality), a list/set (membership) or a (min, max) tuple
+    with None for an open bound
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, condition in (filters or {}).items():
+        values = df[column]
+        if isinstance(condition, tuple):
+            low, high = condition
+            if low is not None:
+                mask &= (values >= low).to_numpy()
+            if high is not None:
+                mask &= (values <= high).to_numpy()
+        elif isinstance(condition, (list, set, frozenset)):
+            mask &= values.isin(list(condition)).to_numpy()
+        else:
+            mask &= (values == condition).to_numpy()
+    return mask
+
+
+def normalize_query(query):
+    # "  Mentor for  Generative AI? " and "mentor for generative ai" share a cache entry
+    return re.sub(r"\s+", " ", str(query)).strip().strip("?!.,;:").strip().lower()
+
+
+def freeze_filters(filters):
+    """
+    Hashable form of a filters dict, for use in cache keys
+    """
+    frozen = []
+    for column, condition in sorted((filters or {}).items()):
+        if isinstance(condition, (list, set, frozenset)):
+            condition = ("in",) + tuple(sorted(map(str, condition)))
+        frozen.append((column, condition))
+    return tuple(frozen)
+
+
+class QueryCache:
+    """
+    Thread-safe bounded LRU cache with a TTL, counting hits and misses so it can be sized
+    """
+
+    def __init__(self, maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            try:
+                value = self._cache[key]
+                self.hits += 1
+                return value
+            except KeyError:
+                self.misses += 1
+        # Computed outside the lock so a slow miss doesn't block other lookups
+        value = compute()
+        with self._lock:
+            self._cache[key] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+                "ttl_seconds": self._cache.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
+
+
+class EducatorRegistry:
+    """
+    Process-wide owner of the embedding model and educator index.
+    Streamlit runs every session in the same process, so all sessions share one copy.
+    """
+
+    def __init__(self, csv_path, model_name=MODEL_NAME, index_dir=INDEX_DIR, index_type=INDEX_TYPE,
+                 nprobe=NPROBE):
+        self.csv_path = csv_path
+        self.model_name = model_name
+        self.index_dir = index_dir
+        self.index_type = index_type
+        self.nprobe = nprobe
+        self.df = None
+        self.index = None
+        self.model = None
+        self.embeddings = None
+        self.row_ids = None
+        self.version = None
+        self.last_sync = None
+        self.load_seconds = None
+        self._csv_stat = None
+        self._row_lookup = None
+        self.embedding_cache = QueryCache()
+        # Keys include the data version, and the cache is cleared when it changes
+        self.result_cache = QueryCache()
+        self._load_lock = threading.Lock()
+        # The tokenizer isn't safe for concurrent calls. The index lock only guards swapping in a
+        # reloaded index; FAISS searches are read-only and run concurrently outside it
+        self._encode_lock = threading.Lock()
+        self._index_lock = threading.RLock()
+
+    def _stat(self):
+        info = os.stat(self.csv_path)
+        return info.st_mtime_ns, info.st_size
+
+    def _load(self):
+        start = time.perf_counter()
+        csv_stat = self._stat()
+        df, index, model, embeddings, row_ids, summary, version = load_or_build(
+            self.csv_path, self.model_name, self.index_dir, model=self.model,
+            index_type=self.index_type, nprobe=self.nprobe)
+        with self._index_lock:
+            self.df, self.model, self.embeddings, self.row_ids = df, model, embeddings, row_ids
+            self.index = index
+            self._row_lookup = pd.Index(df["row_id"].to_numpy(np.int64))
+            self._csv_stat = csv_stat
+            if version != self.version:
+                self.result_cache.clear()
+            self.version = version
+            self.last_sync = summary
+        self.load_seconds = time.perf_counter() - start
+
+    def ensure_loaded(self):
+        if self.index is not None:
+            return self
+        with self._load_lock:
+            if self.index is None:
+                self._load()
+        return self
+
+    def refresh(self):
+        """
+        Pick up edits to the CSV, embedding only the changed rows
+        """
+        self.ensure_loaded()
+        if self._stat() == self._csv_stat:
+            return False
+        with self._load_lock:
+            if self._stat() == self._csv_stat:
+                return False
+            self._load()
+        return True
+
+    def _snapshot(self):
+        """
+        (index, df, row lookup) from one load. A reload publishes new objects rather than
+        modifying these, so searches run on the snapshot without holding the lock.
+        """
+        self.ensure_loaded()
+        with self._index_lock:
+            return self.index, self.df, self._row_lookup
+
+    def set_nprobe(self, nprobe):
+        self.ensure_loaded()
+        with self._index_lock:
+            self.nprobe = nprobe
+            set_nprobe(self.index, nprobe)
+
+    def encode(self, texts):
+        self.ensure_loaded()
+        with self._encode_lock:
+            return embed(self.model, texts)
+
+    def encode_query(self, query):
+        """
+        Embedding of a single query, shared across sessions via the embedding cache
+        """
+        key = normalize_query(query)
+
+        def compute():
+            embedding = self.encode([key])
+            embedding.flags.writeable = False
+            return embedding
+
+        return self.embedding_cache.get_or_compute(key, compute)
+
+    def cached_results(self, kind, query, k, filters, min_score, compute):
+        """
+        Ranked results for a search, cached until the educator data changes
+        """
+        key = (kind, self.version, normalize_query(query), k, freeze_filters(filters), min_score)
+        return self.result_cache.get_or_compute(key, compute)
+
+    def search(self, query_embeddings, k, allowed_ids=None):
+        """
+        Returns (cosine similarities, row ids); ids of -1 mark empty result slots.
+        `allowed_ids` restricts the scan to those rows.
+        """
+        index = self._snapshot()[0]
+        params = None if allowed_ids is None else search_params(index, allowed_ids, self.nprobe)
+        return index.search(np.ascontiguousarray(query_embeddings, dtype=np.float32), k, params=params)
+
+    def search_many(self, queries, k=5, filters=None, batch_size=64, min_score=None, query_embeddings=None):
+        """
+        Match many queries in one go: a single batched encode and one FAISS search.
+        Returns a long-format DataFrame with one row per (query, rank) hit, scored by
+        cosine similarity; hits below `min_score` are dropped.
+        """
+        index, df, row_lookup = self._snapshot()
+        queries = list(queries)
+        if not queries:
+            return pd.DataFrame(columns=["query_index", "query", "rank", "row_id", "score"] + RESULT_COLUMNS)
+
+        if query_embeddings is None:
+            with self._encode_lock:
+                query_embeddings = embed(self.model, queries, batch_size)
+
+        params = None
+        if filters:
+            # Restrict the scan to matching rows instead of filtering the top-k afterwards
+            allowed = df["row_id"].to_numpy(np.int64)[filter_mask(df, filters)]
+            if not len(allowed):
+                return self.search_many([], k)
+            params = search_params(index, allowed, self.nprobe)
+        scores, ids = index.search(np.ascontiguousarray(query_embeddings, dtype=np.float32), k, params=params)
+
+        hits = pd.DataFrame({
+            "query_index": np.repeat(np.arange(len(queries)), k),
+            "rank": np.tile(np.arange(1, k + 1), len(queries)),
+            "row_id": ids.ravel(),
+            "score": scores.ravel(),
+        })
+        hits = hits[hits["row_id"] >= 0]
+        if min_score is not None:
+            hits = hits[hits["score"] >= min_score]
+        hits.insert(1, "query", np.asarray(queries, dtype=object)[hits["query_index"].to_numpy()])
+        positions = row_lookup.get_indexer(hits["row_id"].to_numpy(np.int64))
+        profiles = df.iloc[positions][RESULT_COLUMNS].reset_index(drop=True)
+        return pd.concat([hits.reset_index(drop=True), profiles], axis=1)
+
+    def pager(self, query, page_size=5, min_score=None, filters=None):
+        """
+        Paginated vector search for one query; the query is embedded once
+        """
+        embedding = self.encode_query(query)
+        return MentorPager(
+            lambda limit: self.cached_results(
+                "vector", query, limit, filters, min_score,
+                lambda: self.search_many([query], limit, filters, min_score=min_score, query_embeddings=embedding)),
+            page_size, version=self.version)
+
+    def rows_for(self, ids):
+        """
+        Map row ids returned by `search` to positions in `df` (-1 where unknown)
+        """
+        return self._row_lookup.get_indexer(np.asarray(ids, dtype=np.int64).ravel())
+
+    def stats(self):
+        """
+        Load time and approximate memory held by the shared resources
+        """
+        self.ensure_loaded()
+        model_bytes = sum(p.numel() * p.element_size() for p in self.model.parameters())
+        return {
+            "index_type": self.index_type,
+            "index_class": type(faiss.downcast_index(self.index.index)).__name__,
+            "nprobe": self.nprobe,
+            "load_seconds": self.load_seconds,
+            "rows": int(self.index.ntotal),
+            "last_sync": self.last_sync,
+            "model_bytes": int(model_bytes),
+            "index_bytes": index_memory_bytes(self.index),
+            "embeddings_bytes": int(self.embeddings.nbytes),
+            "dataframe_bytes": int(self.df.memory_usage(deep=True).sum()),
+            "process_peak_rss_bytes": _peak_rss_bytes(),
+            "embedding_cache": self.embedding_cache.stats(),
+            "result_cache": self.result_cache.stats(),
+        }
+
+
+class MentorPager:
+    """
+    Cursor-based pages over one ranked result list. `fetch(limit)` returns the
+    top-`limit` results; they are cached, and only fetched again (with a larger
+    limit) when a page runs past the cached candidates.
+    """
+
+    def __init__(self, fetch, page_size=5, initial_candidates=50, version=None):
+        self.fetch = fetch
+        self.page_size = page_size
+        self.version = version
+        self._limit = max(initial_candidates, page_size)
+        self._results = fetch(self._limit)
+
+    def _exhausted(self):
+        # A short list means the index had nothing more above the cutoff
+        return len(self._results) < self._limit
+
+    def page(self, cursor=0):
+        """
+        Returns (results, next_cursor); next_cursor is None on the last page
+        """
+        end = cursor + self.page_size
+        while end > len(self._results) and not self._exhausted():
+            self._limit *= 2
+            self._results = self.fetch(self._limit)
+        page = self._results.iloc[cursor:end]
+        has_more = end < len(self._results) or not self._exhausted()
+        return page, (end if has_more else None)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(csv_path, model_name=MODEL_NAME, index_dir=INDEX_DIR, index_type=INDEX_TYPE):
+    """
+    Return the shared registry for this CSV/model/index type, creating it on first use
+    """
+    key = (os.path.abspath(csv_path), model_name, os.path.abspath(index_dir), index_type)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = EducatorRegistry(csv_path, model_name, index_dir, index_type)
+        registry = _registries[key]
+    return registry.ensure_loaded()
+
+
+def _peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return int(peak if sys.platform == "darwin" else peak * 1024)
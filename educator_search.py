@@ -0,0 +1,237 @@
+import re
+import threading
+from collections import Counter
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from educator_index import RESULT_COLUMNS, NUMERIC_COLUMNS, MentorPager
+from text_tokens import tokenize
+
+CATEGORICAL_COLUMNS = ["Expertise"]
+
+
+class BM25Index:
+    """
+    Inverted index with BM25 weights precomputed per (document, term).
+    Stored column-major so scoring a query only touches the postings of its terms.
+    """
+
+    def __init__(self, texts, k1=1.5, b=0.75):
+        self.vocab = {}
+        rows, cols, counts = [], [], []
+        doc_lengths = []
+        for doc, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                rows.append(doc)
+                cols.append(self.vocab.setdefault(term, len(self.vocab)))
+                counts.append(count)
+
+        n_docs = len(doc_lengths)
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+        tf = np.asarray(counts, dtype=np.float32)
+        doc_lengths = np.asarray(doc_lengths, dtype=np.float32)
+        avg_length = doc_lengths.mean() if n_docs else 0.0
+
+        doc_freq = np.bincount(cols, minlength=len(self.vocab))
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        norm = k1 * (1 - b + b * doc_lengths[rows] / max(avg_length, 1e-9))
+        weights = idf[cols] * tf * (k1 + 1) / (tf + norm)
+        self.matrix = sparse.csc_matrix((weights, (rows, cols)), shape=(n_docs, len(self.vocab)))
+
+    def scores(self, query):
+        terms = [self.vocab[t] for t in set(tokenize(query)) if t in self.vocab]
+        if not terms:
+            return np.zeros(self.matrix.shape[0], dtype=np.float32)
+        return np.asarray(self.matrix[:, terms].sum(axis=1)).ravel()
+
+
+class MetadataFilters:
+    """
+    Precomputed bitmaps for categorical values and sorted orders for numeric ranges,
+    so a filter is a few bitwise ANDs instead of a scan over the dataframe
+    """
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.bitmaps = {}
+        for column in CATEGORICAL_COLUMNS:
+            values = df[column].astype(str).str.strip().str.lower()
+            codes, uniques = pd.factorize(values)
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+        self.sorted_numeric = {}
+        for column in NUMERIC_COLUMNS:
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(np.float64)
+            order = np.argsort(values, kind="stable")
+            self.sorted_numeric[column] = (values[order], order)
+
+    def _all(self):
+        return np.packbits(np.ones(self.size, dtype=bool))
+
+    def _range(self, column, low, high):
+        sorted_values, order = self.sorted_numeric[column]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        # NaNs sort last and never fall inside a range
+        end = np.searchsorted(sorted_values, np.inf if high is None else high, side="right")
+        hits = np.zeros(self.size, dtype=bool)
+        hits[order[start:end]] = True
+        return np.packbits(hits)
+
+    def _categories(self, column, values):
+        empty = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        bitmap = empty
+        for value in values:
+            bitmap = bitmap | self.bitmaps[column].get(str(value).strip().lower(), empty)
+        return bitmap
+
+    def mask(self, filters):
+        """
+        Boolean mask for `filters`, using the same conventions as educator_index.filter_mask
+        """
+        bitmap = self._all()
+        for column, condition in (filters or {}).items():
+            if column in self.sorted_numeric:
+                if isinstance(condition, tuple):
+                    bitmap &= self._range(column, *condition)
+                else:
+                    bitmap &= self._range(column, condition, condition)
+            elif column in self.bitmaps:
+                values = condition if isinstance(condition, (list, set, frozenset, tuple)) else [condition]
+                bitmap &= self._categories(column, values)
+            else:
+                raise KeyError(f"Unsupported filter column: {column}")
+        return np.unpackbits(bitmap, count=self.size).astype(bool)
+
+
+def parse_query(query, expertise_values):
+    """
+    Pull structured hints out of free text, e.g. "Blockchain mentor with 15+ years"
+    becomes Expertise=Blockchain and Years_of_Experience >= 15 (see HybridSearch.search
+    for how they are applied)
+    """
+    filters = {}
+    years = re.search(r"(\d+)\s*\+?\s*(?:years|yrs)", query, re.IGNORECASE)
+    if years:
+        filters["Years_of_Experience"] = (int(years.group(1)), None)
+
+    lowered = query.lower()
+    # Prefer the longest match so "Game Development" wins over "Development"
+    matches = [v for v in expertise_values if re.search(rf"(?<!\w){re.escape(v.lower())}(?!\w)", lowered)]
+    if matches:
+        filters["Expertise"] = max(matches, key=len)
+    return filters
+
+
+class HybridSearch:
+    """
+    BM25 + vector search over the shared educator registry, fused with
+    reciprocal rank fusion and pre-filtered on metadata bitmaps
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.version = registry.version
+        self.df = registry.df
+        self.bm25 = BM25Index(self.df["combined_text"])
+        self.filters = MetadataFilters(self.df)
+        self.expertise_values = sorted(self.df["Expertise"].dropna().astype(str).unique())
+
+    def search(self, query, k=5, filters=None, parse=True, candidates=None, rrf_k=60,
+               min_score=None, query_embedding=None):
+        """
+        Top-k rows by fused rank. Vector hits below `min_score` cosine similarity are
+        dropped; rows that only match lexically are kept.
+
+        `filters` are hard constraints. With `parse`, hints in the query text are softer:
+        a mentioned expertise boosts matching rows, and a parsed range (e.g. "15+ years")
+        only applies while it leaves at least k rows.
+        """
+        filters = dict(filters or {})
+        boosted = None
+        if parse:
+            parsed = parse_query(query, self.expertise_values)
+            expertise = parsed.pop("Expertise", None)
+            if expertise is not None and "Expertise" not in filters:
+                # Many mentors cover a field only in their "about" text, so excluding every
+                # other Expertise value would drop relevant rows before ranking
+                boosted = self.filters.mask({"Expertise": [expertise]})
+            # Explicit filters take precedence over ones parsed from the text
+            narrowed = {**parsed, **filters}
+            if parsed and self.filters.mask(narrowed).sum() >= k:
+                filters = narrowed
+        candidates = candidates or max(k * 10, 50)
+
+        mask = self.filters.mask(filters)
+        allowed = np.flatnonzero(mask)
+        if not len(allowed):
+            return self._results(np.array([], dtype=np.int64), {}, {}, {})
+
+        # Lexical candidates among allowed rows
+        bm25_scores = self.bm25.scores(query)
+        top = allowed[np.argsort(-bm25_scores[allowed], kind="stable")[:candidates]]
+        lexical_scores = {pos: score for pos, score in zip(top, bm25_scores[top]) if score > 0}
+        lexical_ranked = [pos for pos in top if pos in lexical_scores]
+
+        # Vector candidates, restricted to the same rows inside FAISS
+        allowed_ids = None
+        if len(allowed) < len(self.df):
+            allowed_ids = self.df["row_id"].to_numpy(np.int64)[allowed]
+        if query_embedding is None:
+            query_embedding = self.registry.encode([query])
+        similarities, ids = self.registry.search(query_embedding, candidates, allowed_ids)
+        valid = ids[0] >= 0
+        if min_score is not None:
+            valid &= similarities[0] >= min_score
+        vector_ranked = self.registry.rows_for(ids[0][valid])
+        vector_scores = dict(zip(vector_ranked, similarities[0][valid]))
+
+        fused = {}
+        for ranked in (lexical_ranked, vector_ranked):
+            for rank, pos in enumerate(ranked):
+                if pos >= 0:
+                    fused[pos] = fused.get(pos, 0.0) + 1.0 / (rrf_k + rank + 1)
+        if boosted is not None:
+            # The parsed expertise counts as one more ranked list, with its rows tied at the top
+            for pos in np.flatnonzero(boosted & mask):
+                fused[pos] = fused.get(pos, 0.0) + 1.0 / (rrf_k + 1)
+        order = sorted(fused, key=fused.get, reverse=True)[:k]
+        return self._results(np.asarray(order, dtype=np.int64), fused, lexical_scores, vector_scores)
+
+    def pager(self, query, page_size=5, filters=None, min_score=None):
+        """
+        Paginated hybrid search; the query embedding and each ranked list come from
+        the registry's shared caches, so repeated queries skip the model and the index
+        """
+        query_embedding = self.registry.encode_query(query)
+        return MentorPager(
+            lambda limit: self.registry.cached_results(
+                "hybrid", query, limit, filters, min_score,
+                lambda: self.search(query, limit, filters, min_score=min_score, query_embedding=query_embedding)),
+            page_size, version=self.version)
+
+    def _results(self, positions, fused, lexical_scores, vector_scores):
+        results = self.df.iloc[positions][["row_id"] + RESULT_COLUMNS].reset_index(drop=True)
+        results.insert(0, "rank", np.arange(1, len(positions) + 1))
+        results["score"] = [fused[p] for p in positions]
+        results["lexical_score"] = [lexical_scores.get(p, 0.0) for p in positions]
+        results["vector_score"] = [vector_scores.get(p, np.nan) for p in positions]
+        return results
+
+
+_hybrid = {}
+_hybrid_lock = threading.Lock()
+
+
+def get_hybrid_search(registry):
+    """
+    Shared HybridSearch for the registry, rebuilt when the educator data changes
+    """
+    with _hybrid_lock:
+        engine = _hybrid.get(id(registry))
+        if engine is None or engine.version != registry.version:
+            engine = HybridSearch(registry)
+            _hybrid[id(registry)] = engine
+    return engine
@@ -0,0 +1,117 @@
+"""
+Persistent cache of fetched job postings per company.
+
+Fresh entries (younger than the TTL) are served as-is. Stale entries are served
+immediately while a background thread revalidates them. Entries past the stale
+window are refetched before returning. Every refetch is conditional
+(ETag / Last-Modified), so an unchanged company costs one 304 instead of every page.
+"""
+import os
+import threading
+import time
+import job_fetcher
+from disk_cache import DiskCache, content_key
+
+JOB_CACHE_DIR = os.path.join(".cache", "jobs")
+JOB_CACHE_MAX_BYTES = int(os.getenv("JOB_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Seconds an entry is fresh, then how much longer it may be served while it revalidates
+JOB_CACHE_TTL = int(os.getenv("JOB_CACHE_TTL", "3600"))
+JOB_CACHE_STALE_TTL = int(os.getenv("JOB_CACHE_STALE_TTL", str(24 * 3600)))
+
+
+class JobCache:
+    def __init__(self, url=job_fetcher.JOBS_API_URL, directory=JOB_CACHE_DIR, ttl=JOB_CACHE_TTL,
+                 stale_ttl=JOB_CACHE_STALE_TTL, max_bytes=JOB_CACHE_MAX_BYTES):
+        self.url = url
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.store = DiskCache(directory, max_bytes)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _key(self, company):
+        return content_key("jobs", self.url, company.strip().lower())
+
+    def get(self, company):
+        return self.store.get_json(self._key(company))
+
+    def put(self, result):
+        if result["error"]:
+            # A partial result must not replace a complete one or look fresh
+            return
+        entry = {key: result.get(key) for key in ("company", "jobs", "pages", "etag", "last_modified")}
+        entry["fetched_at"] = time.time()
+        self.store.set_json(self._key(result["company"]), entry)
+
+    def _fetch(self, companies, entries):
+        results = job_fetcher.fetch_companies(companies, self.url, cached=entries)
+        for result in results.values():
+            self.put(result)
+        return results
+
+    def _refresh_in_background(self, companies, entries):
+        with self._lock:
+            companies = [company for company in companies if company not in self._refreshing]
+            self._refreshing.update(companies)
+        if not companies:
+            return
+
+        def refresh():
+            try:
+                self._fetch(companies, entries)
+            except Exception:
+                # Best effort: the stale entries stay and the next read tries again
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(companies)
+
+        threading.Thread(target=refresh, name="job-cache-refresh", daemon=True).start()
+
+    def fetch(self, companies):
+        """
+        {company: result} in job_fetcher's format plus "cache": fresh | stale |
+        revalidated | fetched | stale-error, and "age_seconds" of the data served
+        """
+        now = time.time()
+        entries, results, missing, stale = {}, {}, [], []
+        for company in dict.fromkeys(companies):
+            entry = self.get(company)
+            if entry is not None:
+                entries[company] = entry
+            age = now - entry["fetched_at"] if entry else None
+            if entry is not None and age < self.ttl:
+                results[company] = {**entry, "error": None, "cache": "fresh", "age_seconds": age}
+            elif entry is not None and age < self.ttl + self.stale_ttl:
+                results[company] = {**entry, "error": None, "cache": "stale", "age_seconds": age}
+                stale.append(company)
+            else:
+                missing.append(company)
+
+        if stale:
+            self._refresh_in_background(stale, {company: entries[company] for company in stale})
+        if missing:
+            for company, result in self._fetch(missing, entries).items():
+                entry = entries.get(company)
+                if result["error"] and entry is not None and not result["jobs"]:
+                    # Upstream is down: old data beats no data
+                    results[company] = {**entry, "error": result["error"], "cache": "stale-error",
+                                        "age_seconds": now - entry["fetched_at"]}
+                else:
+                    results[company] = {**result, "cache": "revalidated" if result["not_modified"] else "fetched",
+                                        "age_seconds": 0.0}
+        return results
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_job_cache(url=job_fetcher.JOBS_API_URL):
+    """
+    Shared cache per API URL, so background refreshes are deduplicated across sessions
+    """
+    with _caches_lock:
+        if url not in _caches:
+            _caches[url] = JobCache(url)
+        return _caches[url]
@@ -0,0 +1,209 @@
+"""
+Concurrent job fetching for many companies over one pooled aiohttp session.
+
+    python job_fetcher.py stub-server --port 8766 --fail-rate 0.2
+    python job_fetcher.py fetch Acme Globex Initech --url http://127.0.0.1:8766/search
+
+Companies are fetched concurrently (paginated results page by page), connections are
+capped per host, transient failures are retried with backoff, and a company that
+still fails is reported alongside whatever pages it did return.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import aiohttp
+import job_generator
+import job_store
+
+JOBS_API_URL = os.getenv("JOBS_API_URL", "https://api.jobs.example.com/search")
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("JOBS_API_CONCURRENCY", "4"))
+REQUEST_TIMEOUT = 10
+RETRIES = 3
+MAX_PAGES = 20
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _page_jobs(payload):
+    """
+    (jobs, next_page) from a response: either a bare list (one page) or
+    {"jobs": [...], "next_page": n | null}
+    """
+    if isinstance(payload, list):
+        return payload, None
+    return payload.get("jobs") or [], payload.get("next_page")
+
+
+async def _get_json(session, url, params, retries=RETRIES, base_delay=0.5, max_delay=10.0, headers=None):
+    """
+    (status, payload, response headers); payload is None for 304 Not Modified
+    """
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status in RETRY_STATUSES:
+                    retry_after = response.headers.get("Retry-After", "")
+                    raise FetchError(f"HTTP {response.status}", float(retry_after) if retry_after.isdigit() else None)
+                if response.status == 304:
+                    return response.status, None, response.headers
+                response.raise_for_status()
+                return response.status, await response.json(content_type=None), response.headers
+        except (FetchError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == retries:
+                raise FetchError(str(e) or type(e).__name__) from e
+            # Exponential backoff with full jitter, unless the server said how long to wait;
+            # either way no single wait exceeds max_delay
+            delay = getattr(e, "retry_after", None)
+            if delay is not None:
+                delay = min(delay, max_delay)
+            await asyncio.sleep(delay or random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+
+async def fetch_company(session, company, url=JOBS_API_URL, retries=RETRIES, max_pages=MAX_PAGES, cached=None):
+    """
+    All pages for one company. Never raises: a failure is reported in "error"
+    next to the jobs from the pages that did arrive.
+
+    If `cached` (an earlier result) carries an ETag or Last-Modified, the first page
+    is requested conditionally; a 304 means the cached jobs are still current and
+    no further pages are fetched.
+    """
+    start = time.perf_counter()
+    jobs, page, pages, error = [], 1, 0, None
+    validators = {"etag": None, "last_modified": None}
+    conditional = {}
+    if cached and cached.get("etag"):
+        conditional["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        conditional["If-Modified-Since"] = cached["last_modified"]
+    while page and pages < max_pages:
+        try:
+            status, payload, headers = await _get_json(session, url, {"company": company, "page": page}, retries,
+                                                       headers=conditional if page == 1 else None)
+        except Exception as e:
+            error = f"page {page}: {e}"
+            break
+        if status == 304:
+            return {**cached, "company": company, "error": None, "not_modified": True,
+                    "seconds": round(time.perf_counter() - start, 3)}
+        if page == 1:
+            # The first page's validators stand for the whole result set
+            validators = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        page_jobs, page = _page_jobs(payload)
+        jobs.extend(page_jobs)
+        pages += 1
+    return {"company": company, "jobs": jobs, "pages": pages, "error": error, "not_modified": False,
+            "seconds": round(time.perf_counter() - start, 3), **validators}
+
+
+async def fetch_companies_async(companies, url=JOBS_API_URL, per_host=MAX_CONNECTIONS_PER_HOST,
+                                timeout=REQUEST_TIMEOUT, retries=RETRIES, max_pages=MAX_PAGES, cached=None):
+    # One keep-alive pool for every request; the connector caps connections per host,
+    # so extra requests queue for a free connection instead of opening new ones
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=per_host)
+    async with aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT},
+                                     timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        results = await asyncio.gather(*(fetch_company(session, company, url, retries, max_pages,
+                                                       (cached or {}).get(company))
+                                         for company in companies))
+    return {result["company"]: result for result in results}
+
+
+def fetch_companies(companies, url=JOBS_API_URL, **kwargs):
+    """
+    Synchronous entry point: {company: {"jobs", "pages", "error", "seconds", "etag", ...}}
+    """
+    companies = list(dict.fromkeys(companies))
+    return asyncio.run(fetch_companies_async(companies, url, **kwargs))
+
+
+class StubJobsHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in job search API: deterministic paginated postings per company (from
+    job_generator) with ETags, and an optional share of requests failing with 503
+    """
+    page_size = 25
+    fail_rate = 0.0
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        company = query.get("company", ["Acme"])[0]
+        page = int(query.get("page", ["1"])[0])
+        if random.random() < self.fail_rate:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        seed = int(hashlib.sha256(company.encode()).hexdigest(), 16) % 2 ** 32
+        total = 40 + seed % 60
+        start = (page - 1) * self.page_size
+        rows = max(0, min(self.page_size, total - start))
+        batch = job_generator.generate_job_batch(company, rows, seed, start, today="2025-01-01")
+        jobs = job_store.to_records(job_store.to_job_frame(batch))
+        body = json.dumps({"jobs": jobs, "next_page": page + 1 if start + rows < total else None}).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent job fetching")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="fetch postings for several companies")
+    fetch.add_argument("companies", nargs="+")
+    fetch.add_argument("--url", default=JOBS_API_URL)
+    fetch.add_argument("--per-host", type=int, default=MAX_CONNECTIONS_PER_HOST)
+    fetch.add_argument("--retries", type=int, default=RETRIES)
+
+    stub = commands.add_parser("stub-server", help="serve a local stand-in job search API")
+    stub.add_argument("--host", default="127.0.0.1")
+    stub.add_argument("--port", type=int, default=8766)
+    stub.add_argument("--page-size", type=int, default=25)
+    stub.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with 503")
+    args = parser.parse_args()
+
+    if args.command == "stub-server":
+        StubJobsHandler.page_size = args.page_size
+        StubJobsHandler.fail_rate = args.fail_rate
+        server = ThreadingHTTPServer((args.host, args.port), StubJobsHandler)
+        print(f"Stub job API listening on http://{args.host}:{args.port}/search", file=sys.stderr)
+        server.serve_forever()
+    else:
+        start = time.perf_counter()
+        results = fetch_companies(args.companies, args.url, per_host=args.per_host, retries=args.retries)
+        for result in results.values():
+            status = f"failed ({result['error']})" if result["error"] else "ok"
+            print(f"{result['company']}: {len(result['jobs'])} jobs, {result['pages']} page(s), "
+                  f"{result['seconds']}s, {status}", file=sys.stderr)
+        print(f"{len(results)} companies in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
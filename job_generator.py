@@ -0,0 +1,130 @@
+"""
+Seeded synthetic job postings, generated column-wise with NumPy in Arrow batches.
+
+    python job_generator.py --company Acme --rows 10000000 --output jobs.parquet
+
+The same seed, chunk size and --today always produce the same rows.
+"""
+import argparse
+import sys
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+JOB_TITLES = [
+    "Software Engineer", "Data Scientist", "Product Manager",
+    "DevOps Engineer", "UI/UX Designer", "Full Stack Developer",
+    "Machine Learning Engineer", "Frontend Developer", "Backend Developer"
+]
+LOCATIONS = ["Remote", "New York", "San Francisco", "London", "Berlin", "Singapore"]
+SKILLS_POOL = [
+    "Python", "JavaScript", "React", "AWS", "Docker", "Kubernetes",
+    "SQL", "Java", "Node.js", "TypeScript", "Git", "MongoDB"
+]
+# Annual USD: minimum in [80k, 150k], maximum 20k-50k above it
+SALARY_MIN_RANGE = (80, 150)
+SALARY_SPREAD_RANGE = (20, 50)
+SKILLS_PER_JOB = (3, 6)
+MAX_AGE_DAYS = 30
+CHUNK_ROWS = 1_000_000
+
+JOB_SCHEMA = pa.schema([
+    ("title", pa.dictionary(pa.int8(), pa.string())),
+    ("company", pa.dictionary(pa.int8(), pa.string())),
+    ("location", pa.dictionary(pa.int8(), pa.string())),
+    ("salary_min", pa.float64()),
+    ("salary_max", pa.float64()),
+    ("salary_currency", pa.dictionary(pa.int8(), pa.string())),
+    ("description", pa.dictionary(pa.int8(), pa.string())),
+    ("requirements", pa.list_(pa.string())),
+    ("posted_date", pa.date32()),
+])
+
+
+def _categorical(codes, values):
+    return pa.DictionaryArray.from_arrays(pa.array(codes.astype(np.int8)), pa.array(values))
+
+
+def _constant(value, rows):
+    return _categorical(np.zeros(rows, dtype=np.int8), [value])
+
+
+def generate_job_batch(company_name, rows, seed=None, start=0, today=None):
+    """
+    `rows` postings as an Arrow table with JOB_SCHEMA. `start` offsets the random
+    stream so consecutive batches differ; seed=None gives fresh random data.
+    """
+    rng = np.random.default_rng(None if seed is None else [seed, start])
+    today = np.datetime64(today or "today", "D")
+
+    title_codes = rng.integers(0, len(JOB_TITLES), rows)
+    location_codes = rng.integers(0, len(LOCATIONS), rows)
+    salary_min = rng.integers(SALARY_MIN_RANGE[0], SALARY_MIN_RANGE[1] + 1, rows) * 1000.0
+    salary_max = salary_min + rng.integers(SALARY_SPREAD_RANGE[0], SALARY_SPREAD_RANGE[1] + 1, rows) * 1000.0
+    posted = today - rng.integers(1, MAX_AGE_DAYS + 1, rows).astype("timedelta64[D]")
+
+    # Distinct skills per row: a random permutation of the pool per row, keeping the first k
+    counts = rng.integers(SKILLS_PER_JOB[0], SKILLS_PER_JOB[1] + 1, rows)
+    order = rng.random((rows, len(SKILLS_POOL)), dtype=np.float32).argsort(axis=1)
+    chosen = order[np.arange(len(SKILLS_POOL)) < counts[:, None]]
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+    skills = pa.ListArray.from_arrays(pa.array(offsets), pc.take(pa.array(SKILLS_POOL), pa.array(chosen)))
+
+    return pa.Table.from_arrays([
+        _categorical(title_codes, JOB_TITLES),
+        _constant(company_name, rows),
+        _categorical(location_codes, LOCATIONS),
+        pa.array(salary_min),
+        pa.array(salary_max),
+        _constant("USD", rows),
+        _constant(f"Exciting opportunity at {company_name}...", rows),
+        skills,
+        pa.array(posted),
+    ], schema=JOB_SCHEMA)
+
+
+def iter_job_batches(company_name, rows, chunk_rows=CHUNK_ROWS, seed=None, today=None):
+    for start in range(0, rows, chunk_rows):
+        yield generate_job_batch(company_name, min(chunk_rows, rows - start), seed, start, today)
+
+
+def generate_jobs(company_name, rows, chunk_rows=CHUNK_ROWS, seed=None, today=None):
+    """
+    All postings in memory as one Arrow table
+    """
+    batches = list(iter_job_batches(company_name, rows, chunk_rows, seed, today))
+    return pa.concat_tables(batches) if batches else JOB_SCHEMA.empty_table()
+
+
+def write_jobs_parquet(path, company_name, rows, chunk_rows=CHUNK_ROWS, seed=None, today=None,
+                       compression="zstd"):
+    """
+    Stream postings to a Parquet file one row group per chunk, so memory stays bounded
+    """
+    with pq.ParquetWriter(path, JOB_SCHEMA, compression=compression) as writer:
+        for batch in iter_job_batches(company_name, rows, chunk_rows, seed, today):
+            writer.write_table(batch)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic job postings")
+    parser.add_argument("--company", default="Acme")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--today", help="anchor date for posted_date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--output", required=True, help="Parquet file to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_jobs_parquet(args.output, args.company, args.rows, args.chunk_rows, args.seed, args.today)
+    seconds = time.perf_counter() - start
+    print(f"Wrote {args.rows} postings to {args.output} in {seconds:.2f}s "
+          f"({args.rows / seconds:,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
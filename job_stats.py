@@ -0,0 +1,87 @@
+"""
+Compact statistics over a typed job frame (see job_store.to_job_frame), small enough
+to send to an LLM no matter how many postings they summarize.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+QUANTILES = (0.25, 0.5, 0.75)
+TOP_SKILLS = 20
+TOP_PAIRS = 15
+TOP_GROUPS = 15
+
+
+def _salary_quantiles(df, column):
+    salaries = df[["salary_min", "salary_max"]].mean(axis=1).rename("salary")
+    grouped = salaries.groupby(df[column], observed=True)
+    table = grouped.quantile(list(QUANTILES)).unstack()
+    if table.empty:
+        # No postings carry this column (or there are no postings at all)
+        return {}
+    table.columns = [f"p{int(q * 100)}" for q in QUANTILES]
+    table["postings"] = grouped.size()
+    table = table.sort_values("postings", ascending=False).head(TOP_GROUPS)
+    return {str(name): {key: (None if pd.isna(value) else round(float(value)))
+                        for key, value in row.items()}
+            for name, row in table.iterrows()}
+
+
+def _skill_stats(requirements):
+    exploded = requirements.explode().dropna()
+    if exploded.empty:
+        return {}, []
+    codes, skills = pd.factorize(exploded)
+    frequency = pd.Series(np.bincount(codes), index=skills).sort_values(ascending=False)
+
+    # Job x skill incidence matrix; X^T X counts how often each pair appears together
+    rows = pd.factorize(exploded.index)[0]
+    incidence = sparse.csr_matrix((np.ones(len(codes), dtype=np.int32), (rows, codes)),
+                                  shape=(rows.max() + 1, len(skills)))
+    incidence.data[:] = 1
+    together = sparse.triu(incidence.T @ incidence, k=1).tocoo()
+    order = np.argsort(-together.data, kind="stable")[:TOP_PAIRS]
+    pairs = [{"skills": [str(skills[together.row[i]]), str(skills[together.col[i]])],
+              "postings": int(together.data[i])} for i in order]
+    return {str(skill): int(count) for skill, count in frequency.head(TOP_SKILLS).items()}, pairs
+
+
+def _posting_trend(posted):
+    posted = posted.dropna()
+    if posted.empty:
+        return {}
+    weekly = posted.dt.to_period("W").value_counts().sort_index()
+    latest = posted.max()
+    last_week = int((posted > latest - pd.Timedelta(days=7)).sum())
+    previous_week = int(((posted <= latest - pd.Timedelta(days=7)) & (posted > latest - pd.Timedelta(days=14))).sum())
+    return {
+        "first_posted": posted.min().strftime("%Y-%m-%d"),
+        "last_posted": latest.strftime("%Y-%m-%d"),
+        "postings_per_week": {str(week.start_time.date()): int(count) for week, count in weekly.items()},
+        "last_7_days": last_week,
+        "previous_7_days": previous_week,
+        "week_over_week_change": None if previous_week == 0 else round((last_week - previous_week) / previous_week, 3),
+    }
+
+
+def job_digest(df):
+    """
+    Postings per company, salary quantiles (annual USD) per title and location,
+    skill frequencies and co-occurrences, and posting-rate trends
+    """
+    salaries = df[["salary_min", "salary_max"]].mean(axis=1)
+    skills, pairs = _skill_stats(df["requirements"])
+    return {
+        "postings": int(len(df)),
+        "postings_per_company": {str(k): int(v) for k, v in df["company"].value_counts().items() if v},
+        "salary_annual_usd": {
+            "with_salary": int(salaries.notna().sum()),
+            **{f"p{int(q * 100)}": (None if pd.isna(v) else round(float(v)))
+               for q, v in salaries.quantile(list(QUANTILES)).items()},
+            "by_title": _salary_quantiles(df, "title"),
+            "by_location": _salary_quantiles(df, "location"),
+        },
+        "top_skills": skills,
+        "top_skill_pairs": pairs,
+        "posting_trend": _posting_trend(df["posted_date"]),
+    }
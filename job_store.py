@@ -0,0 +1,133 @@
+"""
+Typed, columnar job postings for market analysis. Raw records are normalized once at
+ingest (salary text -> annual USD bounds, dates -> datetime64, repeated strings ->
+categoricals), so charts and statistics read ready-made numeric columns.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+CATEGORICAL_COLUMNS = ["title", "company", "location", "salary_currency", "salary_period"]
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR"}
+# Approximate conversion rates, only used to put salaries on one axis
+USD_PER_UNIT = {"USD": 1.0, "EUR": 1.08, "GBP": 1.27, "INR": 0.012, "CAD": 0.73, "AUD": 0.66, "SGD": 0.74}
+# Working hours/days/weeks/months per year
+PERIODS_PER_YEAR = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+# Without an explicit period, amounts below this are taken to be hourly rates
+HOURLY_CEILING = 500
+
+_CURRENCY = r"[$€£₹]|usd|eur|gbp|inr|cad|aud|sgd"
+_AMOUNT = r"\d[\d,]*(?:\.\d+)?"
+SALARY_RE = (
+    rf"(?P<currency>{_CURRENCY})?\s*(?P<low>{_AMOUNT})\s*(?P<low_unit>[km])?\b"
+    rf"(?:\s*(?:-|–|—|to)\s*(?:{_CURRENCY})?\s*(?P<high>{_AMOUNT})\s*(?P<high_unit>[km])?\b)?"
+    rf"\s*(?P<currency_suffix>{_CURRENCY})?"
+)
+PERIOD_PATTERNS = {
+    "hour": r"(?:\bper|\ban?|/)\s*(?:hour|hr|h)\b|hourly",
+    "day": r"(?:\bper|\ban?|/)\s*day\b|daily",
+    "week": r"(?:\bper|\ban?|/)\s*(?:week|wk)\b|weekly",
+    "month": r"(?:\bper|\ban?|/)\s*(?:month|mo)\b|monthly",
+    "year": r"(?:\bper|\ban?|/)\s*(?:year|yr|annum)\b|annual|yearly|\bp\.?a\b",
+}
+
+
+UNIT_MULTIPLIERS = {"k": 1e3, "m": 1e6}
+
+
+def _amount(values, units):
+    # Element-wise maps rather than .str, which refuses columns where nothing matched
+    amount = pd.to_numeric(values.map(lambda v: v.replace(",", "") if isinstance(v, str) else None),
+                           errors="coerce").astype(float)
+    return amount * units.map(lambda u: UNIT_MULTIPLIERS.get(u.lower(), 1.0) if isinstance(u, str) else 1.0).astype(float)
+
+
+def normalize_salary(salary):
+    """
+    Parse free-text salaries ("$80,000-$120,000", "€60k–75k", "45/hr", "GBP 4,000 per month")
+    into annual USD bounds. Returns salary_min, salary_max, salary_currency and salary_period
+    columns aligned with `salary`; unparseable entries get NaN bounds.
+
+    >>> bool(normalize_salary(pd.Series(["Competitive", None]))[["salary_min", "salary_max"]].isna().all(axis=None))
+    True
+    """
+    text = salary.map(lambda v: v.strip().lower() if isinstance(v, str) else None).astype(object)
+    parts = text.str.extract(SALARY_RE, expand=True).astype(object)
+    parts = parts.where(parts.notna(), None)
+
+    # "80-120k": a unit written only after the range applies to its bare lower end too
+    bare_low = _amount(parts["low"], parts["low_unit"].map(lambda _: None))
+    shared = parts["high"].notna() & (bare_low < 1000)
+    low_unit = parts["low_unit"].where(parts["low_unit"].notna() | ~shared, parts["high_unit"])
+    low = _amount(parts["low"], low_unit)
+    high = _amount(parts["high"], parts["high_unit"])
+    high = high.where(high.notna(), low)
+
+    symbol = parts["currency"].where(parts["currency"].notna(), parts["currency_suffix"])
+    currency = symbol.map(lambda v: CURRENCY_SYMBOLS.get(v, v.upper()) if isinstance(v, str) else None)
+    currency = currency.where(currency.notna() | low.isna(), "USD").astype(object)
+
+    period = pd.Series(None, index=salary.index, dtype="object")
+    for name, pattern in PERIOD_PATTERNS.items():
+        period = period.mask(period.isna() & text.str.contains(pattern, regex=True, na=False), name)
+    implied = pd.Series(np.where(high < HOURLY_CEILING, "hour", "year"), index=salary.index, dtype="object")
+    period = period.where(period.notna() | low.isna(), implied)
+
+    factor = period.map(PERIODS_PER_YEAR).astype(float) * currency.map(USD_PER_UNIT).astype(float)
+    return pd.DataFrame({
+        "salary_min": np.minimum(low, high) * factor,
+        "salary_max": np.maximum(low, high) * factor,
+        "salary_currency": currency,
+        "salary_period": period,
+    }, index=salary.index)
+
+
+def to_job_frame(jobs):
+    """
+    Typed DataFrame from API/sample records (list of dicts) or a job_generator Arrow table
+    """
+    if isinstance(jobs, pa.Table):
+        # Dictionary columns arrive as categoricals and date32 as datetime64
+        df = jobs.to_pandas(date_as_object=False)
+    else:
+        df = pd.DataFrame(list(jobs))
+    for column in ["title", "company", "location", "description", "posted_date"]:
+        if column not in df:
+            df[column] = None
+    if "requirements" not in df:
+        df["requirements"] = [[] for _ in range(len(df))]
+
+    for column in ["salary_min", "salary_max"]:
+        df[column] = pd.to_numeric(df[column], errors="coerce") if column in df else np.nan
+    for column in ["salary_currency", "salary_period"]:
+        if column not in df:
+            df[column] = None
+        df[column] = df[column].astype(object)
+    if "salary" in df:
+        # Typed and free-text records can arrive in one batch (e.g. API results plus
+        # sample-data fallbacks): parse the text of every row that has no bounds yet
+        untyped = df["salary_min"].isna() & df["salary"].notna()
+        if untyped.any():
+            parsed = normalize_salary(df.loc[untyped, "salary"])
+            for column in parsed:
+                df.loc[untyped, column] = parsed[column]
+        df = df.drop(columns=["salary"])
+    # Typed sources (e.g. job_generator) give annual bounds
+    df["salary_period"] = df["salary_period"].where(df["salary_period"].notna() | df["salary_min"].isna(), "year")
+
+    df["posted_date"] = pd.to_datetime(df["posted_date"], errors="coerce")
+    # Records without the key come through as NaN when other records in the batch have it
+    df["requirements"] = df["requirements"].map(
+        lambda skills: list(skills) if isinstance(skills, (list, tuple, np.ndarray)) else [])
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype("category")
+    return df
+
+
+def to_records(df):
+    """
+    JSON-ready dicts, for downloads and for prompts that need example postings
+    """
+    records = df.assign(posted_date=df["posted_date"].dt.strftime("%Y-%m-%d"))
+    records = records.astype({column: "object" for column in CATEGORICAL_COLUMNS})
+    return records.astype(object).where(records.notna(), None).to_dict("records")
@@ -0,0 +1,362 @@
+"""
+One place for every LLM call in the app: shared clients (and their HTTP connection
+pools), per-provider concurrency and rate limits, timeouts, retries with exponential
+backoff, and per-call latency/token metrics.
+
+    text = llm_gateway.groq_chat(prompt, temperature=0.3)
+    text = llm_gateway.gemini_generate([job_description, *resume_parts, prompt])
+    llm = llm_gateway.get_chat_groq(temperature=0.7)   # for LangChain chains and agents
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GROQ_MODEL = "mixtral-8x7b-32768"
+GEMINI_MODEL = "gemini-1.5-flash"
+# Most recent calls kept for metrics()
+METRICS_WINDOW = 1000
+# Optional JSONL file every call record is appended to
+METRICS_LOG = os.getenv("LLM_METRICS_LOG")
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    max_concurrency: int
+    requests_per_minute: int
+    timeout: float
+    retries: int
+
+
+def _limits_from_env(provider, max_concurrency, requests_per_minute, timeout, retries):
+    prefix = f"LLM_{provider.upper()}_"
+    return ProviderLimits(
+        max_concurrency=int(os.getenv(prefix + "CONCURRENCY", str(max_concurrency))),
+        requests_per_minute=int(os.getenv(prefix + "RPM", str(requests_per_minute))),
+        timeout=float(os.getenv(prefix + "TIMEOUT", str(timeout))),
+        retries=int(os.getenv(prefix + "RETRIES", str(retries))),
+    )
+
+
+PROVIDER_LIMITS = {
+    "groq": _limits_from_env("groq", 4, 30, 60.0, 4),
+    "gemini": _limits_from_env("gemini", 4, 60, 120.0, 4),
+}
+
+
+class RetryableError(Exception):
+    pass
+
+
+def is_retryable(error):
+    """
+    Rate limits, server errors, timeouts and dropped connections. The SDKs don't
+    share exception types, so beyond RetryableError this goes by name and message.
+    """
+    if isinstance(error, (RetryableError, TimeoutError, ConnectionError)):
+        return True
+    name = type(error).__name__
+    if re.search(r"RateLimit|Timeout|Connection|ServiceUnavailable|InternalServer|ResourceExhausted|DeadlineExceeded",
+                 name):
+        return True
+    return bool(re.search(r"\b(429|500|502|503|504)\b|rate limit|quota|unavailable", str(error), re.I))
+
+
+def with_retries(call, retries=4, base_delay=1.0, max_delay=30.0):
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            # Exponential backoff with full jitter
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+
+class RateLimiter:
+    """
+    Token bucket: bursts up to one minute's allowance, refilled continuously
+    """
+
+    def __init__(self, requests_per_minute):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, float(requests_per_minute))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Provider:
+    """
+    Concurrency slots and rate limit shared by every call to one provider
+    """
+
+    def __init__(self, name, limits):
+        self.name = name
+        self.limits = limits
+        self.slots = threading.BoundedSemaphore(limits.max_concurrency)
+        self.rate_limiter = RateLimiter(limits.requests_per_minute)
+
+    def acquire(self):
+        self.slots.acquire()
+        self.rate_limiter.acquire()
+
+    def release(self):
+        self.slots.release()
+
+
+_providers = {name: Provider(name, limits) for name, limits in PROVIDER_LIMITS.items()}
+
+
+class Metrics:
+    """
+    Thread-safe record of recent calls, summarized per provider
+    """
+
+    def __init__(self, window=METRICS_WINDOW, log_path=METRICS_LOG):
+        self.calls = deque(maxlen=window)
+        self.log_path = log_path
+        self._lock = threading.Lock()
+
+    def record(self, provider, model, latency_seconds, prompt_tokens=None, completion_tokens=None,
+               attempts=1, error=None):
+        record = {
+            "time": time.time(),
+            "provider": provider,
+            "model": model,
+            "latency_seconds": round(latency_seconds, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "attempts": attempts,
+            "error": error,
+        }
+        with self._lock:
+            self.calls.append(record)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+        return record
+
+    def summary(self):
+        with self._lock:
+            calls = list(self.calls)
+        summary = {}
+        for provider in sorted({call["provider"] for call in calls}):
+            rows = [call for call in calls if call["provider"] == provider]
+            latencies = np.asarray([call["latency_seconds"] for call in rows])
+            summary[provider] = {
+                "calls": len(rows),
+                "errors": sum(call["error"] is not None for call in rows),
+                "retries": sum(call["attempts"] - 1 for call in rows),
+                "latency_p50_seconds": round(float(np.percentile(latencies, 50)), 3),
+                "latency_p95_seconds": round(float(np.percentile(latencies, 95)), 3),
+                "prompt_tokens": sum(call["prompt_tokens"] or 0 for call in rows),
+                "completion_tokens": sum(call["completion_tokens"] or 0 for call in rows),
+            }
+        return summary
+
+
+metrics = Metrics()
+
+
+def call(provider, model, request, usage=None):
+    """
+    Run `request()` under the provider's limits, retrying transient failures.
+    Each attempt takes its own concurrency slot and rate-limit token, so backoff
+    sleeps don't hold a slot. `usage(response)` returns (prompt_tokens, completion_tokens).
+    """
+    provider = _providers[provider]
+    attempts = 0
+
+    def attempt():
+        nonlocal attempts
+        attempts += 1
+        provider.acquire()
+        try:
+            return request()
+        finally:
+            provider.release()
+
+    start = time.perf_counter()
+    try:
+        response = with_retries(attempt, provider.limits.retries)
+    except Exception as e:
+        metrics.record(provider.name, model, time.perf_counter() - start, attempts=attempts, error=str(e))
+        raise
+    prompt_tokens, completion_tokens = usage(response) if usage else (None, None)
+    metrics.record(provider.name, model, time.perf_counter() - start, prompt_tokens, completion_tokens, attempts)
+    return response
+
+
+# Groq
+
+@lru_cache(maxsize=1)
+def _groq_http_client():
+    import httpx
+
+    limits = PROVIDER_LIMITS["groq"]
+    return httpx.Client(timeout=limits.timeout,
+                        limits=httpx.Limits(max_connections=limits.max_concurrency,
+                                            max_keepalive_connections=limits.max_concurrency))
+
+
+@lru_cache(maxsize=1)
+def get_groq_client():
+    """
+    Shared Groq SDK client. SDK retries are off: gateway.call owns retries.
+    """
+    from groq import Groq
+
+    return Groq(api_key=os.getenv("GROQ_API_KEY"), max_retries=0, timeout=PROVIDER_LIMITS["groq"].timeout,
+                http_client=_groq_http_client())
+
+
+def _groq_usage(response):
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None, None
+    return usage.prompt_tokens, usage.completion_tokens
+
+
+def groq_chat(prompt, model=GROQ_MODEL, temperature=0.7):
+    response = call("groq", model, lambda: get_groq_client().chat.completions.create(
+        messages=[{"role": "user", "content": prompt}], model=model, temperature=temperature), _groq_usage)
+    return response.choices[0].message.content
+
+
+def _langchain_callbacks():
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class GatewayCallback(BaseCallbackHandler):
+        """
+        Applies the Groq limits and records metrics for LangChain calls, which
+        the SDK makes internally and gateway.call can't wrap
+        """
+
+        def __init__(self):
+            self.started = {}
+            self._lock = threading.Lock()
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+            self._start(run_id, kwargs)
+
+        def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+            self._start(run_id, kwargs)
+
+        def _start(self, run_id, kwargs):
+            _providers["groq"].acquire()
+            model = (kwargs.get("invocation_params") or {}).get("model_name", GROQ_MODEL)
+            with self._lock:
+                self.started[run_id] = (time.perf_counter(), model)
+
+        def _finish(self, run_id):
+            _providers["groq"].release()
+            with self._lock:
+                return self.started.pop(run_id, (time.perf_counter(), GROQ_MODEL))
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            start, model = self._finish(run_id)
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            metrics.record("groq", model, time.perf_counter() - start, usage.get("prompt_tokens"),
+                           usage.get("completion_tokens"))
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            start, model = self._finish(run_id)
+            metrics.record("groq", model, time.perf_counter() - start, error=str(error))
+
+    return [GatewayCallback()]
+
+
+@lru_cache(maxsize=None)
+def get_chat_groq(model=GROQ_MODEL, temperature=0.7):
+    """
+    Shared LangChain ChatGroq per (model, temperature), for chains and agents.
+    Retries use the SDK's own backoff since LangChain makes the request.
+    """
+    from langchain_groq import ChatGroq
+
+    limits = PROVIDER_LIMITS["groq"]
+    return ChatGroq(model_name=model, groq_api_key=os.getenv("GROQ_API_KEY"), temperature=temperature,
+                    request_timeout=limits.timeout, max_retries=limits.retries,
+                    http_client=_groq_http_client(), callbacks=_langchain_callbacks())
+
+
+# Gemini
+
+@lru_cache(maxsize=None)
+def get_gemini_model(model=GEMINI_MODEL):
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return genai.GenerativeModel(model)
+
+
+def _gemini_usage(response):
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return None, None
+    return usage.prompt_token_count, usage.candidates_token_count
+
+
+def gemini_generate(contents, model=GEMINI_MODEL):
+    response = call("gemini", model, lambda: get_gemini_model(model).generate_content(
+        contents, request_options={"timeout": PROVIDER_LIMITS["gemini"].timeout}), _gemini_usage)
+    return response.text
+
+
+def gemini_stream(contents, model=GEMINI_MODEL):
+    """
+    Yield response text chunks. The connection is retried until the stream starts;
+    the concurrency slot is held until it ends.
+    """
+    provider = _providers["gemini"]
+    start = time.perf_counter()
+    attempts = 0
+
+    def open_stream():
+        nonlocal attempts
+        attempts += 1
+        provider.acquire()
+        try:
+            return get_gemini_model(model).generate_content(
+                contents, stream=True, request_options={"timeout": PROVIDER_LIMITS["gemini"].timeout})
+        except Exception:
+            provider.release()
+            raise
+
+    try:
+        response = with_retries(open_stream, provider.limits.retries)
+    except Exception as e:
+        metrics.record("gemini", model, time.perf_counter() - start, attempts=attempts, error=str(e))
+        raise
+    try:
+        for chunk in response:
+            yield chunk.text
+    except Exception as e:
+        metrics.record("gemini", model, time.perf_counter() - start, attempts=attempts, error=str(e))
+        raise
+    else:
+        metrics.record("gemini", model, time.perf_counter() - start, *_gemini_usage(response), attempts)
+    finally:
+        provider.release()
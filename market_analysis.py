@@ -1,85 +1,129 @@
 import streamlit as st
 import pandas as pd
-import requests
-from groq import Groq
+import pyarrow as pa
 import plotly.express as px
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
-import random
-import os
 from dotenv import load_dotenv
+import llm_gateway
+import job_generator
+import job_store
+import job_stats
+import job_cache
 load_dotenv()
 
-# Initialize Groq client
-client = Groq(
-    api_key=os.getenv("GROQ_API_KEY"),
-)
-
-def generate_sample_data(company_name, num_jobs=10):
+def generate_sample_data(company_name, num_jobs=10, seed=None):
     """
     Generate sample job data for testing and development
     """
-    job_titles = [
-        "Software Engineer", "Data Scientist", "Product Manager",
-        "DevOps Engineer", "UI/UX Designer", "Full Stack Developer",
-        "Machine Learning Engineer", "Frontend Developer", "Backend Developer"
-    ]
-    
-    locations = ["Remote", "New York", "San Francisco", "London", "Berlin", "Singapore"]
-    
-    skills_pool = [
-        "Python", "JavaScript", "React", "AWS", "Docker", "Kubernetes",
-        "SQL", "Java", "Node.js", "TypeScript", "Git", "MongoDB"
-    ]
-    
+    df = job_generator.generate_job_batch(company_name, num_jobs, seed).to_pandas()
+    thousands_min = (df["salary_min"] // 1000).astype(int).astype(str)
+    thousands_max = (df["salary_max"] // 1000).astype(int).astype(str)
+    df["salary"] = "$" + thousands_min + ",000-$" + thousands_max + ",000"
+    df["posted_date"] = pd.to_datetime(df["posted_date"]).dt.strftime('%Y-%m-%d')
+    df["requirements"] = df["requirements"].map(list)
+    columns = ["title", "company", "location", "salary", "description", "requirements", "posted_date"]
+    return df[columns].astype({"title": str, "company": str, "location": str, "description": str}).to_dict("records")
+
+def fetch_real_jobs(company_names):
+    """
+    Fetch job postings for several companies concurrently (see job_fetcher), through
+    the job cache. Companies whose fetch failed outright fall back to sample data.
+    """
     jobs = []
-    for _ in range(num_jobs):
-        min_salary = random.randint(80, 150)
-        max_salary = min_salary + random.randint(20, 50)
-        
-        job = {
-            "title": random.choice(job_titles),
-            "company": company_name,
-            "location": random.choice(locations),
-            "salary": f"${min_salary},000-${max_salary},000",
-            "description": f"Exciting opportunity at {company_name}...",
-            "requirements": random.sample(skills_pool, random.randint(3, 6)),
-            "posted_date": (datetime.now() - pd.Timedelta(days=random.randint(1, 30))).strftime('%Y-%m-%d')
-        }
-        jobs.append(job)
-    
+    for company, result in job_cache.get_job_cache().fetch(company_names).items():
+        if result["cache"] == "stale-error":
+            st.warning(f"Could not refresh {company} ({result['error']}). "
+                       f"Showing data from {result['age_seconds'] / 60:.0f} minutes ago.")
+        elif result["error"]:
+            kept = f"Using the {len(result['jobs'])} postings fetched before the failure." if result["jobs"] \
+                else "Using sample data instead."
+            st.warning(f"Could not fetch all data for {company} ({result['error']}). {kept}")
+        elif result["cache"] in ("fresh", "stale"):
+            refreshing = ", refreshing in the background" if result["cache"] == "stale" else ""
+            st.caption(f"{company}: cached data from {result['age_seconds'] / 60:.0f} minutes ago{refreshing}")
+        jobs.extend(result["jobs"] or generate_sample_data(company))
     return jobs
 
-def fetch_real_jobs(company_name):
+# Raw postings per map step, sized to stay well inside the model's context window
+MAP_CHUNK_CHARS = 12_000
+MAP_REDUCE_WORKERS = 4
+# Summaries that still don't fit after this many passes are passed on as they are
+MAX_REDUCE_PASSES = 3
+# Raw postings read by the map step: the newest few per (title, location), capped overall,
+# so the number of LLM calls doesn't grow with the number of postings
+POSTINGS_PER_GROUP = 2
+MAX_SAMPLED_POSTINGS = 150
+
+MAP_PROMPT = """
+    Summarize the following job postings in under 150 words. Note recurring titles,
+    salary levels, unusual requirements and anything the aggregate statistics would miss:
+    {postings}
+"""
+
+REDUCE_PROMPT = """
+    Combine the following summaries of job postings into one summary of under 200 words.
+    Keep recurring titles, salary levels, unusual requirements and anything the aggregate
+    statistics would miss:
+    {summaries}
+"""
+
+def sample_postings(df, per_group=POSTINGS_PER_GROUP, limit=MAX_SAMPLED_POSTINGS):
     """
-    Fetch real job data from public APIs
-    Note: This is a placeholder - you'll need to replace with actual API endpoints
+    A spread of raw postings for summarize_postings: the newest `per_group` per
+    (title, location), at most `limit` in all
     """
-    try:
-        # Example using a public API (replace with your preferred job API)
-        api_url = f"https://api.jobs.example.com/search?company={company_name}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        
-        response = requests.get(api_url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            # Fall back to sample data if API fails
-            return generate_sample_data(company_name)
-            
-    except Exception as e:
-        st.warning(f"Could not fetch real data: {str(e)}. Using sample data instead.")
-        return generate_sample_data(company_name)
+    newest = df.sort_values("posted_date", ascending=False, kind="stable")
+    return newest.groupby(["title", "location"], observed=True, dropna=False, sort=False).head(per_group).head(limit)
+
+def _chunks(texts, max_chars):
+    chunk, size = [], 0
+    for text in texts:
+        if chunk and size + len(text) > max_chars:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(text)
+        size += len(text)
+    if chunk:
+        yield chunk
+
+def summarize_postings(records, max_chars=MAP_CHUNK_CHARS, max_passes=MAX_REDUCE_PASSES):
+    """
+    Map-reduce over raw postings: summarize chunks in parallel, then combine the
+    summaries until they fit in one chunk or max_passes reduce passes have run
+    """
+    texts = [json.dumps(record, separators=(",", ":")) for record in records]
+    prompt, field = MAP_PROMPT, "postings"
+    with ThreadPoolExecutor(max_workers=MAP_REDUCE_WORKERS) as pool:
+        for _ in range(max_passes + 1):
+            chunks = ["\n".join(chunk) for chunk in _chunks(texts, max_chars)]
+            texts = list(pool.map(
+                lambda chunk: llm_gateway.groq_chat(prompt.format(**{field: chunk}), temperature=0.3), chunks))
+            if len(texts) == 1 or sum(map(len, texts)) <= max_chars:
+                break
+            prompt, field = REDUCE_PROMPT, "summaries"
+    return texts
 
-def analyze_with_groq(data):
+def analyze_with_groq(jobs_df, include_examples=False):
     """
-    Analyze job market data using Groq LLM
+    Analyze job market data using Groq LLM. The prompt carries precomputed
+    statistics (job_stats.job_digest) rather than the postings, so its size doesn't
+    grow with the data; include_examples adds map-reduce summaries of a sample of the
+    raw postings (see sample_postings).
     """
-    prompt = f"""
-    Analyze the following job market data and provide detailed insights about the company's market position:
-    {json.dumps(data, indent=2)}
+    try:
+        digest = job_stats.job_digest(jobs_df)
+        notes = ""
+        if include_examples and len(jobs_df):
+            summaries = summarize_postings(job_store.to_records(sample_postings(jobs_df)))
+            notes = "Notes from reading the individual postings:\n" + "\n\n".join(summaries)
+
+        prompt = f"""
+    Analyze the following job market statistics and provide detailed insights about the company's market position.
+    Salaries are annual USD; quantiles are p25/p50/p75.
+    {json.dumps(digest, indent=2)}
+    {notes}
     
     Please provide a comprehensive analysis covering:
     1. Overall Market Position
@@ -108,57 +152,44 @@ def analyze_with_groq(data):
     
     Format the analysis in clear sections with detailed explanations.
     """
-    
-    try:
-        response = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="mixtral-8x7b-32768",
-            temperature=0.3,
-        )
-        return response.choices[0].message.content
+        return llm_gateway.groq_chat(prompt, temperature=0.3)
     except Exception as e:
         return f"Error in analysis: {str(e)}"
 
-def create_visualizations(jobs_data):
+def create_visualizations(df):
     """
-    Create various visualizations from the job data
+    Create various visualizations from a typed job frame (see job_store.to_job_frame)
     """
-    df = pd.DataFrame(jobs_data)
-    
-    # Extract salary ranges and convert to numeric
-    df[['min_salary', 'max_salary']] = df['salary'].str.extract(r'\$(\d+),000-\$(\d+),000').astype(float)
-    
     visualizations = {}
     
-    # Salary distribution
-    fig_salary = px.box(df, y=['min_salary', 'max_salary'], 
+    # Salary distribution, from the annual USD bounds normalized at ingest
+    salaries = pd.DataFrame({'min_salary': df['salary_min'] / 1000, 'max_salary': df['salary_max'] / 1000})
+    fig_salary = px.box(salaries, y=['min_salary', 'max_salary'], 
                        title="Salary Range Distribution",
-                       labels={'value': 'Salary (thousands)', 'variable': 'Range'})
+                       labels={'value': 'Annual salary (USD thousands)', 'variable': 'Range'})
     visualizations['salary_dist'] = fig_salary
     
     # Skills frequency
-    skills_list = [skill for job in df['requirements'].tolist() for skill in job]
-    skills_freq = pd.Series(skills_list).value_counts()
+    skills_freq = df['requirements'].explode().dropna().value_counts()
     fig_skills = px.bar(x=skills_freq.index, y=skills_freq.values,
                        title="Most Required Skills",
                        labels={'x': 'Skills', 'y': 'Frequency'})
     visualizations['skills_freq'] = fig_skills
     
     # Job titles distribution
-    title_dist = df['title'].value_counts()
+    title_dist = df['title'].value_counts().loc[lambda counts: counts > 0]
     fig_titles = px.pie(values=title_dist.values, names=title_dist.index,
                        title="Job Titles Distribution")
     visualizations['title_dist'] = fig_titles
     
     # Location distribution
-    location_dist = df['location'].value_counts()
+    location_dist = df['location'].value_counts().loc[lambda counts: counts > 0]
     fig_location = px.bar(x=location_dist.index, y=location_dist.values,
                          title="Job Locations Distribution",
                          labels={'x': 'Location', 'y': 'Number of Jobs'})
     visualizations['location_dist'] = fig_location
     
     # Timeline of job postings
-    df['posted_date'] = pd.to_datetime(df['posted_date'])
     posting_timeline = df.groupby('posted_date').size().reset_index(name='count')
     fig_timeline = px.line(posting_timeline, x='posted_date', y='count',
                           title="Job Posting Timeline",
@@ -175,12 +206,15 @@ def main():
     
     # Sidebar for inputs
     st.sidebar.header("Analysis Parameters")
-    company_name = st.sidebar.text_input("Enter Company Name")
+    company_name = st.sidebar.text_input("Enter Company Name", help="Separate several companies with commas")
+    company_names = [name.strip() for name in company_name.split(",") if name.strip()]
     data_source = st.sidebar.radio("Data Source", ["Sample Data", "Real Data (API)"])
-    num_jobs = st.sidebar.slider("Number of Jobs (Sample Data)", 5, 50, 10)
+    num_jobs = st.sidebar.slider("Number of Jobs (Sample Data)", 5, 10_000, 10)
+    include_examples = st.sidebar.checkbox("Also read individual postings (slower, more LLM calls)",
+                                           value=False)
     analyze_button = st.sidebar.button("Analyze")
     
-    if analyze_button and company_name:
+    if analyze_button and company_names:
         try:
             # Show progress
             progress_bar = st.progress(0)
@@ -190,22 +224,24 @@ def main():
             status_text.text("Fetching job data...")
             progress_bar.progress(25)
             
+            # Normalized once here; analysis, charts and download all read the typed frame
             if data_source == "Sample Data":
-                jobs_data = generate_sample_data(company_name, num_jobs)
-                print("Job data: ", jobs_data)
+                jobs_df = job_store.to_job_frame(pa.concat_tables(
+                    [job_generator.generate_job_batch(name, num_jobs) for name in company_names]))
             else:
-                jobs_data = fetch_real_jobs(company_name)
+                jobs_df = job_store.to_job_frame(fetch_real_jobs(company_names))
+            jobs_data = job_store.to_records(jobs_df)
             
             # Analyze with Groq
             status_text.text("Analyzing market position...")
             progress_bar.progress(50)
-            analysis = analyze_with_groq(jobs_data)
+            analysis = analyze_with_groq(jobs_df, include_examples)
             print("Analysis: ", analysis)
             
             # Create visualizations
             status_text.text("Creating visualizations...")
             progress_bar.progress(75)
-            visualizations = create_visualizations(jobs_data)
+            visualizations = create_visualizations(jobs_df)
             
             # Display results
             progress_bar.progress(100)
@@ -223,12 +259,12 @@ def main():
                 st.download_button(
                     label="Download Analysis Report",
                     data=json.dumps({
-                        'company': company_name,
+                        'company': ", ".join(company_names),
                         'analysis': analysis,
                         'raw_data': jobs_data,
                         'generated_at': datetime.now().isoformat()
                     }, indent=2),
-                    file_name=f"{company_name}_analysis.json",
+                    file_name=f"{'_'.join(company_names)}_analysis.json",
                     mime="application/json"
                 )
             
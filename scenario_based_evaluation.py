@@ -1,22 +1,15 @@
 import io
 import streamlit as st
 import fitz  # PyMuPDF for parsing PDF
-from langchain_groq import ChatGroq
 from langchain.prompts import PromptTemplate
-import os
 from dotenv import load_dotenv
+import llm_gateway
 load_dotenv()
 
 # Load API key from environment variable
 def main():
-    GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-
-    # Initialize the Groq LLM
-    llm = ChatGroq(
-        model_name="mixtral-8x7b-32768",
-        groq_api_key=GROQ_API_KEY,
-        temperature=0.7
-    )
+    # Shared Groq LLM from the gateway, so reruns don't build a new client
+    llm = llm_gateway.get_chat_groq(temperature=0.7)
 
     # Function to extract text from a PDF file-like object
     def extract_text_from_pdf(file):
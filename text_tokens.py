@@ -0,0 +1,11 @@
+"""
+Tokenizer shared by the lexical search and ATS scoring, so both split skills the same way.
+"""
+import re
+
+# Keeps "c++", "c#" and "node.js" whole; "/" and "-" split, so "CI/CD" and "ci-cd" agree
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text):
+    return [token.rstrip(".") for token in _TOKEN_RE.findall(str(text).lower())]
@@ -1,10 +1,10 @@
 import streamlit as st
 import pandas as pd
-import faiss
-from sentence_transformers import SentenceTransformer
 import os
-import google.generativeai as genai  
 from dotenv import load_dotenv
+import educator_index
+import educator_search
+import llm_gateway
 
 def main():
     # Load environment variables
@@ -14,25 +14,15 @@ def main():
         st.error("Google API Key not found. Please check your .env file.")
         st.stop()
 
-    genai.configure(api_key=api_key)
-    chat_model = genai.GenerativeModel("gemini-1.5-flash")
-
     # Function to load and process dataset
     def load_data(file_path):
         try:
-            df = pd.read_csv(file_path, encoding='latin1')
-            df["combined_text"] = df.apply(lambda row: " ".join(row.values.astype(str)), axis=1)
-            
-            # Load embedding model
-            model = SentenceTransformer("all-MiniLM-L6-v2")
-            embeddings = model.encode(df["combined_text"].tolist())
-            
-            # Create FAISS index
-            dimension = embeddings.shape[1]
-            index = faiss.IndexFlatL2(dimension)
-            index.add(embeddings)
-            
-            return df, index, model, embeddings
+            # Embeddings and index are persisted and only rebuilt when the CSV or model changes;
+            # the registry shares one model and index across every session in the process
+            registry = educator_index.get_registry(file_path)
+            # Embeds only mentors that were added or edited since the last load
+            registry.refresh()
+            return registry
         except Exception as e:
             st.error(f"Error loading data: {e}")
             st.stop()
@@ -43,40 +33,78 @@ def main():
         st.error(f"CSV file not found at {csv_file_path}. Please upload it to the server.")
         st.stop()
 
-    df, index, model, embeddings = load_data(csv_file_path)
+    registry = load_data(csv_file_path)
+    df = registry.df
 
     # Streamlit UI setup
     st.title("🔍 AI-Powered Profile Search & Assistant Chatbot")
 
     # Search bar
-    query = st.text_input("Enter search query (e.g., 'I need a mentor for Generative AI'):")
+    query = st.text_input("Enter search query (e.g., 'Blockchain mentor with 15+ years'):")
+    with st.expander("🎛️ Filters"):
+        expertise = st.multiselect("Expertise", sorted(df["Expertise"].dropna().unique()))
+        min_years = st.slider("Minimum years of experience", 0, int(df["Years_of_Experience"].max()), 0)
+        min_similarity = st.slider("Minimum similarity", 0.0, 1.0, 0.2, 0.05)
     if st.button("Search"):
         if query:
-            query_embedding = model.encode([query])
-            k = 5
-            distances, indices = index.search(query_embedding, k)
-            
-            # Display results
-            st.subheader("🎯 Top 5 Matching Educators")
-            for idx in indices[0]:
-                profile = df.iloc[idx]
-                st.write(f"**👤 Name:** {profile['Name']}")
-                st.write(f"**🌐 Website:** {profile['Website']}")
-                st.write(f"**📧 Email:** {profile['Email']}")
-                st.write(f"**🛠 Expertise:** {profile['Expertise']}")
-                st.write(f"**📆 Years of Experience:** {profile['Years_of_Experience']} years")
-                st.markdown("---")  # Separator
+            filters = {}
+            if expertise:
+                filters["Expertise"] = expertise
+            if min_years:
+                filters["Years_of_Experience"] = (min_years, None)
+            # Expertise and "N+ years" in the query text boost and narrow the ranking too;
+            # the pager keeps the ranked candidates so later pages don't search again
+            pager = educator_search.get_hybrid_search(registry).pager(
+                query, page_size=5, filters=filters, min_score=min_similarity)
+            page, cursor = pager.page(0)
+            st.session_state.mentor_pager = pager
+            st.session_state.mentor_results = [page]
+            st.session_state.mentor_cursor = cursor
         else:
             st.warning("Please enter a search query.")
 
+    pager = st.session_state.get("mentor_pager")
+    if pager is not None and pager.version != registry.version:
+        # The educator data changed; old row positions are no longer valid
+        st.session_state.pop("mentor_pager")
+        pager = None
+    if pager is not None:
+        results = pd.concat(st.session_state.mentor_results, ignore_index=True)
+        if results.empty:
+            st.info("No educators match that search.")
+
+        # Display results
+        st.subheader(f"🎯 Top {len(results)} Matching Educators")
+        for _, profile in results.iterrows():
+            st.write(f"**👤 Name:** {profile['Name']}")
+            st.write(f"**🌐 Website:** {profile['Website']}")
+            st.write(f"**📧 Email:** {profile['Email']}")
+            st.write(f"**🛠 Expertise:** {profile['Expertise']}")
+            st.write(f"**📆 Years of Experience:** {profile['Years_of_Experience']} years")
+            st.markdown("---")  # Separator
+
+        if st.session_state.mentor_cursor is not None and st.button("Show more mentors"):
+            page, cursor = pager.page(st.session_state.mentor_cursor)
+            st.session_state.mentor_results.append(page)
+            st.session_state.mentor_cursor = cursor
+            st.rerun()
+
+    with st.expander("⚙️ Search engine stats"):
+        st.json(registry.stats())
+
     # Assistant Chatbot
     st.subheader("🤖 Assistant Chatbot")
     user_input = st.text_input("Ask Assistant about networking, career, or interests:")
     if st.button("Chat with Assistant"):
         if user_input:
-            response = chat_model.generate_content(user_input)
-            st.write("**Assistant:**")
-            st.write(response.text)
+            # Shared client, concurrency limit and retries from the gateway
+            try:
+                response = llm_gateway.gemini_generate(user_input)
+            except Exception as e:
+                st.error(f"Assistant unavailable: {e}")
+            else:
+                st.write("**Assistant:**")
+                st.write(response)
         else:
             st.warning("Please enter a question for the assistant.")
 